@@ -3,6 +3,9 @@ from tkinter import ttk, messagebox, scrolledtext
 from typing import Dict, List, Optional, Callable
 from database import Database
 from styles import StyleManager
+from widgets import LazyListbox, SearchEntry
+from db_worker import DatabaseWorker
+from analytics import analyze_quiz
 
 class AdminWindow:
     def __init__(self, db: Database, user: Dict, on_logout: callable = None):
@@ -11,6 +14,7 @@ class AdminWindow:
         self.on_logout = on_logout
         self.current_quiz_id = None
         self.current_questions = []
+        self.question_analysis = {}
         self.is_editing = False
         
         self.window = tk.Tk()
@@ -41,24 +45,40 @@ class AdminWindow:
                                   command=self.sign_out, style='Warning.TButton')
         logout_button.pack(side=tk.LEFT, padx=5)
         
+        self.busy_bar = ttk.Progressbar(header_frame, mode='indeterminate', length=120)
+        self.busy_bar.pack(side=tk.RIGHT, padx=10, pady=20)
+        self.worker = DatabaseWorker(self.window, progress=self.busy_bar)
+        
         main_frame = ttk.Frame(self.window, padding="15")
         main_frame.pack(fill=tk.BOTH, expand=True)
         
         left_frame = ttk.LabelFrame(main_frame, text="Quiz List", padding="10")
         left_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 10))
         
+        search_frame = ttk.Frame(left_frame)
+        search_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(search_frame, text="Search:", font=('Arial', 10, 'bold')).pack(side=tk.LEFT)
+        self.search_entry = SearchEntry(search_frame, self.search_quizzes, font=('Arial', 10))
+        self.search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(10, 0))
+        
         list_frame = ttk.Frame(left_frame)
         list_frame.pack(fill=tk.BOTH, expand=True)
         
         scrollbar = ttk.Scrollbar(list_frame)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        self.quiz_listbox = tk.Listbox(list_frame, yscrollcommand=scrollbar.set,
-                                       font=('Arial', 10), selectmode=tk.SINGLE,
+        self.quiz_listbox = tk.Listbox(list_frame, font=('Arial', 10), selectmode=tk.SINGLE,
                                        bg='white', fg='#2c3e50', selectbackground='#3498db')
         self.quiz_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         self.quiz_listbox.bind("<<ListboxSelect>>", self.on_quiz_select)
         scrollbar.config(command=self.quiz_listbox.yview)
+        self.quiz_pager = LazyListbox(
+            self.quiz_listbox, scrollbar, self.db.get_quizzes_page,
+            format_item=lambda quiz: f"{quiz['id']}: {quiz['title']}",
+            page_cursor=lambda quiz: (quiz["title"], quiz["id"]),
+            worker=self.worker
+        )
         
         quiz_buttons = ttk.Frame(left_frame)
         quiz_buttons.pack(fill=tk.X, pady=(15, 0))
@@ -139,28 +159,38 @@ class AdminWindow:
                   style='Danger.TButton').pack(side=tk.LEFT, padx=3, fill=tk.X, expand=True)
     
     def load_quizzes(self) -> None:
-        self.quiz_listbox.delete(0, tk.END)
-        quizzes = self.db.get_all_quizzes()
-        for quiz in quizzes:
-            self.quiz_listbox.insert(tk.END, f"{quiz['id']}: {quiz['title']}")
+        self.quiz_pager.reset()
+    
+    def search_quizzes(self, query: str) -> None:
+        if query:
+            self.quiz_pager.set_source(
+                lambda cursor, limit: [] if cursor else self.db.search_quizzes(query, limit))
+        else:
+            self.quiz_pager.set_source(self.db.get_quizzes_page)
     
     def on_quiz_select(self, event: tk.Event) -> None:
         selection = self.quiz_listbox.curselection()
         if not selection:
             return
         
-        selected_text = self.quiz_listbox.get(selection[0])
-        quiz_id = int(selected_text.split(":")[0])
+        selected_quiz = self.quiz_pager.get_item(selection[0])
+        if not selected_quiz:
+            return
         
-        quiz = self.db.get_quiz_with_questions(quiz_id)
+        self.worker.submit(self.db.get_quiz_with_questions, selected_quiz["id"],
+                           on_success=self.on_quiz_loaded, error_title="Failed to load quiz")
+    
+    def on_quiz_loaded(self, quiz: Optional[Dict]) -> None:
         if quiz:
-            self.current_quiz_id = quiz_id
+            self.current_quiz_id = quiz["id"]
             self.is_editing = True
             self.title_entry.delete(0, tk.END)
             self.title_entry.insert(0, quiz["title"])
             self.description_text.delete(1.0, tk.END)
             self.description_text.insert(1.0, quiz.get("description", ""))
+            self.question_analysis = {}
             self.load_questions(quiz["questions"])
+            self.load_analysis(quiz["id"])
     
     def load_questions(self, questions: List[Dict]) -> None:
         self.current_questions = questions
@@ -168,7 +198,26 @@ class AdminWindow:
         for i, q in enumerate(questions):
             q_type = "SC" if q['question_type'] == 'single_choice' else "MC"
             preview = q['question_text'][:60] + "..." if len(q['question_text']) > 60 else q['question_text']
-            self.questions_listbox.insert(tk.END, f"Q{i+1} [{q_type}] ({q['points']}pts): {preview}")
+            line = f"Q{i+1} [{q_type}] ({q['points']}pts): {preview}"
+            analysis = self.question_analysis.get(q['id'])
+            if analysis and analysis['difficulty'] is not None:
+                discrimination = "n/a" if analysis['discrimination'] is None else f"{analysis['discrimination']:+.2f}"
+                line += f"  |  p={analysis['difficulty']:.2f} D={discrimination}"
+            self.questions_listbox.insert(tk.END, line)
+    
+    def load_analysis(self, quiz_id: int) -> None:
+        self.worker.submit(analyze_quiz, self.db, quiz_id,
+                           on_success=lambda result: self.on_analysis_loaded(quiz_id, result),
+                           error_title="Failed to analyze responses")
+    
+    def on_analysis_loaded(self, quiz_id: int, result: Dict) -> None:
+        if quiz_id != self.current_quiz_id:
+            return
+        self.question_analysis = result["questions"]
+        selection = self.questions_listbox.curselection()
+        self.load_questions(self.current_questions)
+        for index in selection:
+            self.questions_listbox.selection_set(index)
     
     def new_quiz(self) -> None:
         self.current_quiz_id = None
@@ -177,6 +226,7 @@ class AdminWindow:
         self.description_text.delete(1.0, tk.END)
         self.questions_listbox.delete(0, tk.END)
         self.current_questions = []
+        self.question_analysis = {}
         self.quiz_listbox.selection_clear(0, tk.END)
     
     def cancel_edit(self) -> None:
@@ -190,23 +240,25 @@ class AdminWindow:
             messagebox.showerror("Error", "Quiz title is required")
             return
         
-        try:
-            if self.current_quiz_id and self.is_editing:
-                self.db.update_quiz(self.current_quiz_id, title, description)
-                messagebox.showinfo("Success", "Quiz updated successfully!")
-            else:
-                quiz_id = self.db.create_quiz(title, description, self.user["id"])
-                self.current_quiz_id = quiz_id
-                self.is_editing = True
-                messagebox.showinfo("Success", "Quiz created successfully!")
-            
-            self.load_quizzes()
-            if self.current_quiz_id:
-                quiz = self.db.get_quiz_with_questions(self.current_quiz_id)
-                if quiz:
-                    self.load_questions(quiz["questions"])
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save quiz: {str(e)}")
+        if self.current_quiz_id and self.is_editing:
+            quiz_id = self.current_quiz_id
+            self.worker.submit(self.db.update_quiz, quiz_id, title, description,
+                               on_success=lambda _: self.on_quiz_saved(quiz_id, "Quiz updated successfully!"),
+                               on_error=self.on_save_quiz_failed)
+        else:
+            self.worker.submit(self.db.create_quiz, title, description, self.user["id"],
+                               on_success=lambda quiz_id: self.on_quiz_saved(quiz_id, "Quiz created successfully!"),
+                               on_error=self.on_save_quiz_failed)
+    
+    def on_quiz_saved(self, quiz_id: int, message: str) -> None:
+        self.current_quiz_id = quiz_id
+        self.is_editing = True
+        messagebox.showinfo("Success", message)
+        self.load_quizzes()
+        self.reload_questions()
+    
+    def on_save_quiz_failed(self, error: Exception) -> None:
+        messagebox.showerror("Error", f"Failed to save quiz: {str(error)}")
     
     def delete_quiz(self) -> None:
         selection = self.quiz_listbox.curselection()
@@ -217,16 +269,16 @@ class AdminWindow:
         if not messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this quiz?\nAll questions and responses will be deleted."):
             return
         
-        selected_text = self.quiz_listbox.get(selection[0])
-        quiz_id = int(selected_text.split(":")[0])
+        quiz_id = self.quiz_pager.get_item(selection[0])["id"]
         
-        try:
-            self.db.delete_quiz(quiz_id)
-            messagebox.showinfo("Success", "Quiz deleted successfully!")
-            self.load_quizzes()
-            self.new_quiz()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to delete quiz: {str(e)}")
+        self.worker.submit(self.db.delete_quiz, quiz_id,
+                           on_success=self.on_quiz_deleted,
+                           on_error=lambda e: messagebox.showerror("Error", f"Failed to delete quiz: {str(e)}"))
+    
+    def on_quiz_deleted(self, result: None) -> None:
+        messagebox.showinfo("Success", "Quiz deleted successfully!")
+        self.load_quizzes()
+        self.new_quiz()
     
     def create_demo_quizzes(self) -> None:
         if not messagebox.askyesno("Create Demo Quizzes", 
@@ -234,22 +286,23 @@ class AdminWindow:
                                    "Only missing demo quizzes will be created.\n\nProceed?"):
             return
         
-        try:
-            created_count = self.db.create_demo_quizzes(self.user["id"])
-            if created_count > 0:
-                messagebox.showinfo("Success", f"Created {created_count} demo quiz(es) successfully!")
-            else:
-                messagebox.showinfo("Info", "All demo quizzes already exist.")
-            self.load_quizzes()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to create demo quizzes: {str(e)}")
+        self.worker.submit(self.db.create_demo_quizzes, self.user["id"],
+                           on_success=self.on_demo_quizzes_created,
+                           on_error=lambda e: messagebox.showerror("Error", f"Failed to create demo quizzes: {str(e)}"))
+    
+    def on_demo_quizzes_created(self, created_count: int) -> None:
+        if created_count > 0:
+            messagebox.showinfo("Success", f"Created {created_count} demo quiz(es) successfully!")
+        else:
+            messagebox.showinfo("Info", "All demo quizzes already exist.")
+        self.load_quizzes()
     
     def add_question(self) -> None:
         if not self.current_quiz_id:
             messagebox.showwarning("Warning", "Please create or select a quiz first")
             return
         
-        QuestionDialog(self.window, self.db, self.current_quiz_id, None, self.on_question_saved)
+        QuestionDialog(self.window, self.db, self.worker, self.current_quiz_id, None, self.on_question_saved)
     
     def edit_question(self) -> None:
         selection = self.questions_listbox.curselection()
@@ -258,7 +311,8 @@ class AdminWindow:
             return
         
         question = self.current_questions[selection[0]]
-        QuestionDialog(self.window, self.db, self.current_quiz_id, question, self.on_question_saved)
+        QuestionDialog(self.window, self.db, self.worker, self.current_quiz_id, question, self.on_question_saved,
+                       self.question_analysis.get(question["id"]))
     
     def delete_question(self) -> None:
         selection = self.questions_listbox.curselection()
@@ -270,26 +324,36 @@ class AdminWindow:
             return
         
         question = self.current_questions[selection[0]]
-        try:
-            self.db.delete_question(question["id"])
-            messagebox.showinfo("Success", "Question deleted successfully!")
-            quiz = self.db.get_quiz_with_questions(self.current_quiz_id)
-            if quiz:
-                self.load_questions(quiz["questions"])
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to delete question: {str(e)}")
+        self.worker.submit(self.db.delete_question, question["id"],
+                           on_success=self.on_question_deleted,
+                           on_error=lambda e: messagebox.showerror("Error", f"Failed to delete question: {str(e)}"))
+    
+    def on_question_deleted(self, result: None) -> None:
+        messagebox.showinfo("Success", "Question deleted successfully!")
+        self.reload_questions()
     
     def on_question_saved(self) -> None:
-        if self.current_quiz_id:
-            quiz = self.db.get_quiz_with_questions(self.current_quiz_id)
-            if quiz:
-                self.load_questions(quiz["questions"])
+        self.reload_questions()
+    
+    def reload_questions(self) -> None:
+        if not self.current_quiz_id:
+            return
+        quiz_id = self.current_quiz_id
+        self.worker.submit(self.db.get_quiz_with_questions, quiz_id,
+                           on_success=lambda quiz: self.on_questions_reloaded(quiz_id, quiz),
+                           error_title="Failed to load questions")
+    
+    def on_questions_reloaded(self, quiz_id: int, quiz: Optional[Dict]) -> None:
+        if quiz and quiz_id == self.current_quiz_id:
+            self.load_questions(quiz["questions"])
+            self.load_analysis(quiz_id)
     
     def on_question_select(self, event: tk.Event) -> None:
         pass
     
     def sign_out(self) -> None:
         if messagebox.askyesno("Sign Out", "Are you sure you want to sign out?"):
+            self.worker.shutdown()
             self.window.destroy()
             if self.on_logout:
                 self.on_logout()
@@ -298,11 +362,14 @@ class AdminWindow:
         self.window.mainloop()
 
 class QuestionDialog:
-    def __init__(self, parent: tk.Tk, db: Database, quiz_id: int, question: Optional[Dict], callback: Callable):
+    def __init__(self, parent: tk.Tk, db: Database, worker: DatabaseWorker, quiz_id: int,
+                 question: Optional[Dict], callback: Callable, analysis: Optional[Dict] = None):
         self.db = db
+        self.worker = worker
         self.quiz_id = quiz_id
         self.question = question
         self.callback = callback
+        self.analysis = analysis
         
         self.dialog = tk.Toplevel(parent)
         self.dialog.title("Edit Question" if question else "Add Question")
@@ -375,8 +442,9 @@ class QuestionDialog:
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(fill=tk.X, pady=(15, 0))
         
-        ttk.Button(button_frame, text="Save Question", command=self.save_question, 
-                  style='Success.TButton').pack(side=tk.RIGHT, padx=5)
+        self.save_button = ttk.Button(button_frame, text="Save Question", command=self.save_question, 
+                                      style='Success.TButton')
+        self.save_button.pack(side=tk.RIGHT, padx=5)
         ttk.Button(button_frame, text="Cancel", command=self.dialog.destroy, 
                   style='Danger.TButton').pack(side=tk.RIGHT, padx=5)
     
@@ -411,7 +479,14 @@ class QuestionDialog:
         for opt in self.options_data:
             marker = "[X]" if opt["is_correct"] else "[ ]"
             preview = opt['text'][:50] + "..." if len(opt['text']) > 50 else opt['text']
-            self.options_listbox.insert(tk.END, f"[{marker}] {preview}")
+            line = f"[{marker}] {preview}"
+            stats = self.analysis["options"].get(opt.get("id")) if self.analysis else None
+            if stats and stats["selection_rate"] is not None:
+                line += f"  ({stats['selection_rate']:.0%} chose"
+                if stats["upper_rate"] is not None and stats["lower_rate"] is not None:
+                    line += f", upper {stats['upper_rate']:.0%} / lower {stats['lower_rate']:.0%}"
+                line += ")"
+            self.options_listbox.insert(tk.END, line)
     
     def add_option(self) -> None:
         OptionDialog(self.dialog, None, self.on_option_saved)
@@ -464,20 +539,27 @@ class QuestionDialog:
             messagebox.showerror("Error", "Single choice questions can have only one correct answer", parent=self.dialog)
             return
         
-        try:
-            question_id = None
-            if self.question:
-                question_id = self.question["id"]
-            
-            self.db.save_question_with_options(
-                self.quiz_id, question_id, question_text, 
-                q_type, self.points_var.get(), self.options_data
-            )
-            messagebox.showinfo("Success", "Question saved successfully!", parent=self.dialog)
-            self.dialog.destroy()
-            self.callback()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save question: {str(e)}", parent=self.dialog)
+        question_id = None
+        if self.question:
+            question_id = self.question["id"]
+        
+        options = [dict(option) for option in self.options_data]
+        self.save_button.config(state=tk.DISABLED)
+        self.worker.submit(
+            self.db.save_question_with_options,
+            self.quiz_id, question_id, question_text,
+            q_type, self.points_var.get(), options,
+            on_success=self.on_question_saved, on_error=self.on_save_failed
+        )
+    
+    def on_question_saved(self, question_id: int) -> None:
+        messagebox.showinfo("Success", "Question saved successfully!", parent=self.dialog)
+        self.dialog.destroy()
+        self.callback()
+    
+    def on_save_failed(self, error: Exception) -> None:
+        self.save_button.config(state=tk.NORMAL)
+        messagebox.showerror("Error", f"Failed to save question: {str(error)}", parent=self.dialog)
 
 class OptionDialog:
     def __init__(self, parent: tk.Tk, option: Optional[Dict], callback: Callable):
@@ -0,0 +1,310 @@
+import argparse
+import sqlite3
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+from database import Database
+from scoring import AnswerKey
+
+GROUP_FRACTION = 27
+
+COMPLETED_ATTEMPTS_QUERY = """
+    SELECT attempt_id, CAST(score AS REAL) / MAX(total_points, 1)
+    FROM scores
+    WHERE quiz_id = ? AND attempt_id IS NOT NULL
+"""
+
+SELECTION_PATTERNS_QUERY = """
+    SELECT group_concat(CASE grp WHEN 1 THEN pattern END),
+           group_concat(CASE grp WHEN -1 THEN pattern END),
+           group_concat(CASE grp WHEN 0 THEN pattern END)
+    FROM (
+        SELECT g.grp, r.question_id || ':' || group_concat(r.selected_option_id, ' ') AS pattern
+        FROM temp.analysis_groups g
+        JOIN responses r ON r.attempt_id = g.attempt_id
+        GROUP BY g.attempt_id, r.question_id
+    )
+"""
+
+NEW_SCORES_QUERY = """
+    SELECT id, quiz_id, attempt_id, score, total_points, DATE(completed_at)
+    FROM scores
+    WHERE id > ?
+    ORDER BY id
+    LIMIT ?
+"""
+
+UPSERT_DAILY_QUERY = """
+    INSERT INTO quiz_daily_aggregates (quiz_id, day, attempt_count, score_sum, points_sum)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(quiz_id, day) DO UPDATE SET
+        attempt_count = attempt_count + excluded.attempt_count,
+        score_sum = score_sum + excluded.score_sum,
+        points_sum = points_sum + excluded.points_sum
+"""
+
+UPSERT_QUESTION_QUERY = """
+    INSERT INTO question_aggregates (question_id, quiz_id, answered, correct)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(question_id) DO UPDATE SET
+        answered = answered + excluded.answered,
+        correct = correct + excluded.correct
+"""
+
+UPSERT_OPTION_QUERY = """
+    INSERT INTO option_aggregates (option_id, question_id, selected)
+    VALUES (?, ?, ?)
+    ON CONFLICT(option_id) DO UPDATE SET selected = selected + excluded.selected
+"""
+
+def rate(count: int, total: int) -> Optional[float]:
+    return count / total if total else None
+
+def split_groups(attempts: List[Tuple[int, float]], fraction: int = GROUP_FRACTION) -> Dict[int, int]:
+    size = (len(attempts) * fraction + 99) // 100
+    groups = dict.fromkeys((attempt_id for attempt_id, _ in attempts), 0)
+    for attempt_id, _ in sorted(attempts, key=lambda a: (a[1], -a[0]))[:size]:
+        groups[attempt_id] = -1
+    for attempt_id, _ in sorted(attempts, key=lambda a: (-a[1], a[0]))[:size]:
+        groups[attempt_id] = 1
+    return groups
+
+def load_selection_patterns(db: Database, quiz_id: int) -> Tuple[Dict[int, int], Dict[int, Counter]]:
+    conn = db.get_connection()
+    isolation_level = conn.isolation_level
+    conn.isolation_level = None
+    try:
+        cursor = conn.cursor()
+        groups = split_groups(cursor.execute(COMPLETED_ATTEMPTS_QUERY, (quiz_id,)).fetchall())
+        cursor.execute("CREATE TEMP TABLE IF NOT EXISTS analysis_groups (attempt_id INTEGER PRIMARY KEY, grp INTEGER NOT NULL)")
+        cursor.execute("DELETE FROM temp.analysis_groups")
+        cursor.executemany("INSERT INTO temp.analysis_groups (attempt_id, grp) VALUES (?, ?)", groups.items())
+        patterns = cursor.execute(SELECTION_PATTERNS_QUERY).fetchone()
+        cursor.execute("DROP TABLE temp.analysis_groups")
+        return groups, {
+            grp: Counter(joined.split(",")) if joined else Counter()
+            for grp, joined in zip((1, -1, 0), patterns)
+        }
+    finally:
+        conn.isolation_level = isolation_level
+        conn.close()
+
+def analyze_quiz(db: Database, quiz_id: int) -> Dict:
+    key = db.get_answer_key(quiz_id)
+    groups, patterns = load_selection_patterns(db, quiz_id)
+    group_sizes = defaultdict(int)
+    for grp in groups.values():
+        group_sizes[grp] += 1
+    attempt_count, upper_count, lower_count = len(groups), group_sizes[1], group_sizes[-1]
+    
+    answered = defaultdict(int)
+    correct = defaultdict(lambda: defaultdict(int))
+    selected = defaultdict(lambda: defaultdict(int))
+    for grp, counts in patterns.items():
+        for pattern, count in counts.items():
+            question_id, option_ids = pattern.split(":")
+            question_id, option_ids = int(question_id), set(map(int, option_ids.split()))
+            answered[question_id] += count
+            if key is not None and key.is_correct(question_id, list(option_ids)):
+                correct[question_id][grp] += count
+            for option_id in option_ids:
+                selected[option_id][grp] += count
+    
+    questions = {}
+    quiz = db.get_quiz_with_questions(quiz_id)
+    for question in quiz["questions"] if quiz else []:
+        question_id = question["id"]
+        by_group = correct[question_id]
+        correct_count = sum(by_group.values())
+        discrimination = None
+        if upper_count and lower_count:
+            discrimination = by_group[1] / upper_count - by_group[-1] / lower_count
+        options = {}
+        for option in question["options"]:
+            counts = selected[option["id"]]
+            selected_count = sum(counts.values())
+            options[option["id"]] = {
+                "selected": selected_count,
+                "selection_rate": rate(selected_count, attempt_count),
+                "upper_rate": rate(counts[1], upper_count),
+                "lower_rate": rate(counts[-1], lower_count)
+            }
+        questions[question_id] = {
+            "answered": answered[question_id],
+            "correct": correct_count,
+            "difficulty": rate(correct_count, attempt_count),
+            "discrimination": discrimination,
+            "options": options
+        }
+    
+    return {
+        "quiz_id": quiz_id,
+        "attempt_count": attempt_count,
+        "upper_count": upper_count,
+        "lower_count": lower_count,
+        "questions": questions
+    }
+
+def get_high_water_mark(cursor: sqlite3.Cursor, source: str) -> int:
+    row = cursor.execute("SELECT last_id FROM analytics_state WHERE source = ?", (source,)).fetchone()
+    return row[0] if row else 0
+
+def set_high_water_mark(cursor: sqlite3.Cursor, source: str, last_id: int) -> None:
+    cursor.execute("""
+        INSERT INTO analytics_state (source, last_id) VALUES (?, ?)
+        ON CONFLICT(source) DO UPDATE SET last_id = excluded.last_id
+    """, (source, last_id))
+
+def fold_attempt_responses(cursor: sqlite3.Cursor, attempt_quizzes: Dict[int, int]) -> int:
+    selections = defaultdict(dict)
+    attempt_ids = list(attempt_quizzes)
+    response_count = 0
+    for start in range(0, len(attempt_ids), Database.MAX_QUERY_PARAMS):
+        chunk = attempt_ids[start:start + Database.MAX_QUERY_PARAMS]
+        placeholders = ", ".join("?" * len(chunk))
+        cursor.execute(f"""
+            SELECT attempt_id, question_id, selected_option_id
+            FROM responses
+            WHERE attempt_id IN ({placeholders})
+        """, chunk)
+        for attempt_id, question_id, option_id in cursor.fetchall():
+            selections[attempt_id, question_id][option_id] = None
+            response_count += 1
+    
+    keys = {}
+    for quiz_id in set(attempt_quizzes.values()):
+        keys[quiz_id] = AnswerKey.from_rows(quiz_id, cursor.execute(Database.ANSWER_KEY_QUERY, (quiz_id,)).fetchall())
+    
+    questions = {}
+    options = Counter()
+    option_questions = {}
+    for (attempt_id, question_id), selected in selections.items():
+        quiz_id = attempt_quizzes[attempt_id]
+        totals = questions.setdefault(question_id, [quiz_id, 0, 0])
+        totals[1] += 1
+        if keys[quiz_id].is_correct(question_id, list(selected)):
+            totals[2] += 1
+        for option_id in selected:
+            options[option_id] += 1
+            option_questions[option_id] = question_id
+    
+    cursor.executemany(UPSERT_QUESTION_QUERY, [
+        (question_id, quiz_id, answered, correct)
+        for question_id, (quiz_id, answered, correct) in questions.items()
+    ])
+    cursor.executemany(UPSERT_OPTION_QUERY, [
+        (option_id, option_questions[option_id], count)
+        for option_id, count in options.items()
+    ])
+    return response_count
+
+def fold_new_scores(db: Database, batch_size: int = 5000) -> Tuple[int, int, int]:
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        last_id = get_high_water_mark(cursor, "scores")
+        scores = cursor.execute(NEW_SCORES_QUERY, (last_id, batch_size)).fetchall()
+        if not scores:
+            conn.rollback()
+            conn.close()
+            return 0, 0, last_id
+        
+        daily = defaultdict(lambda: [0, 0, 0])
+        attempt_quizzes = {}
+        for _, quiz_id, attempt_id, score, total_points, day in scores:
+            totals = daily[quiz_id, day]
+            totals[0] += 1
+            totals[1] += score
+            totals[2] += total_points
+            if attempt_id is not None:
+                attempt_quizzes[attempt_id] = quiz_id
+        cursor.executemany(UPSERT_DAILY_QUERY, [key + tuple(totals) for key, totals in daily.items()])
+        response_count = fold_attempt_responses(cursor, attempt_quizzes)
+        
+        last_id = scores[-1][0]
+        set_high_water_mark(cursor, "scores", last_id)
+        conn.commit()
+        conn.close()
+        return len(scores), response_count, last_id
+    except Exception as e:
+        conn.rollback()
+        conn.close()
+        raise
+
+def refresh_aggregates(db: Database, batch_size: int = 5000) -> Dict:
+    stats = {"scores": 0, "responses": 0, "last_id": 0}
+    while True:
+        score_count, response_count, stats["last_id"] = fold_new_scores(db, batch_size)
+        stats["scores"] += score_count
+        stats["responses"] += response_count
+        if score_count < batch_size:
+            return stats
+
+def get_quiz_aggregates(db: Database, quiz_id: int) -> Dict:
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT day, attempt_count, score_sum, points_sum
+        FROM quiz_daily_aggregates
+        WHERE quiz_id = ?
+        ORDER BY day
+    """, (quiz_id,))
+    daily = [
+        {"day": day, "attempt_count": attempts, "mean_percentage": rate(score_sum * 100, points_sum)}
+        for day, attempts, score_sum, points_sum in cursor.fetchall()
+    ]
+    attempt_count = sum(row["attempt_count"] for row in daily)
+    
+    cursor.execute("""
+        SELECT question_id, answered, correct
+        FROM question_aggregates
+        WHERE quiz_id = ?
+        ORDER BY question_id
+    """, (quiz_id,))
+    questions = {
+        question_id: {
+            "answered": answered,
+            "correct": correct,
+            "difficulty": rate(correct, attempt_count),
+            "options": {}
+        }
+        for question_id, answered, correct in cursor.fetchall()
+    }
+    cursor.execute("""
+        SELECT o.option_id, o.question_id, o.selected
+        FROM question_aggregates q
+        JOIN option_aggregates o ON o.question_id = q.question_id
+        WHERE q.quiz_id = ?
+    """, (quiz_id,))
+    for option_id, question_id, selected in cursor.fetchall():
+        questions[question_id]["options"][option_id] = {
+            "selected": selected,
+            "selection_rate": rate(selected, attempt_count)
+        }
+    conn.close()
+    
+    return {"quiz_id": quiz_id, "attempt_count": attempt_count, "daily": daily, "questions": questions}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fold newly completed attempts into the stored analytics aggregates")
+    parser.add_argument("--db", default="quiz.db", help="database file")
+    parser.add_argument("--batch-size", type=int, default=5000, help="scores folded per transaction")
+    parser.add_argument("--quiz", type=int, action="append", default=[], help="print the aggregates of this quiz (repeatable)")
+    args = parser.parse_args()
+    
+    with Database(args.db) as db:
+        started = time.perf_counter()
+        stats = refresh_aggregates(db, args.batch_size)
+        print(f"Folded {stats['scores']} scores ({stats['responses']} responses) up to scores.id {stats['last_id']} "
+              f"in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+        for quiz_id in args.quiz:
+            aggregates = get_quiz_aggregates(db, quiz_id)
+            print(f"Quiz {quiz_id}: {aggregates['attempt_count']} attempts")
+            for question_id, question in aggregates["questions"].items():
+                difficulty = "n/a" if question["difficulty"] is None else f"{question['difficulty']:.2f}"
+                print(f"  question {question_id}: answered {question['answered']}, correct {question['correct']}, p={difficulty}")
+
+if __name__ == "__main__":
+    main()
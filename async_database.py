@@ -0,0 +1,96 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from database import Database
+
+class AsyncDatabase:
+    def __init__(self, db_path: str = "quiz.db", max_workers: int = 8, db: Optional[Database] = None, **kwargs):
+        self.db = db if db is not None else Database(db_path, pool_size=max_workers, **kwargs)
+        self.owns_db = db is None
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="async-db")
+        self.closed = False
+    
+    async def __aenter__(self) -> "AsyncDatabase":
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+    
+    async def run(self, fn: Callable, *args, **kwargs):
+        if self.closed:
+            raise RuntimeError("AsyncDatabase is closed")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+    
+    async def authenticate_user(self, username: str, password: str) -> Optional[Dict]:
+        return await self.run(self.db.authenticate_user, username, password)
+    
+    async def login(self, username: str, password: str, source: str = "local") -> Optional[Dict]:
+        return await self.run(self.db.login, username, password, source)
+    
+    async def get_session_user(self, token: str) -> Optional[Dict]:
+        return self.db.get_session_user(token)
+    
+    async def logout(self, token: str) -> None:
+        self.db.logout(token)
+    
+    async def get_all_quizzes(self) -> List[Dict]:
+        return await self.run(self.db.get_all_quizzes)
+    
+    async def get_quizzes_page(self, after: Optional[Tuple[str, int]] = None, limit: int = 50) -> List[Dict]:
+        return await self.run(self.db.get_quizzes_page, after, limit)
+    
+    async def search_quizzes(self, query: str, limit: int = 20) -> List[Dict]:
+        return await self.run(self.db.search_quizzes, query, limit)
+    
+    async def get_quiz_with_questions(self, quiz_id: int) -> Optional[Dict]:
+        return await self.run(self.db.get_quiz_with_questions, quiz_id)
+    
+    async def get_quiz_for_taker(self, quiz_id: int) -> Optional[Dict]:
+        return await self.run(self.db.get_quiz_for_taker, quiz_id)
+    
+    async def get_open_attempt(self, user_id: int, quiz_id: int) -> Optional[Dict]:
+        return await self.run(self.db.get_open_attempt, user_id, quiz_id)
+    
+    async def save_attempt_progress(self, attempt_id: int, responses: Dict[int, List[int]],
+                                    current_index: Optional[int] = None) -> None:
+        await self.run(self.db.save_attempt_progress, attempt_id, responses, current_index)
+    
+    async def submit_attempt(self, user_id: int, quiz_id: int, responses: Dict[int, List[int]],
+                             attempt_id: Optional[int] = None) -> Dict:
+        return await self.run(self.db.submit_attempt, user_id, quiz_id, responses, attempt_id)
+    
+    async def grade_responses(self, quiz_id: int, responses: Dict[int, List[int]]) -> Tuple[int, int]:
+        return await self.run(self.db.grade_responses, quiz_id, responses)
+    
+    async def calculate_score(self, user_id: int, quiz_id: int, attempt_id: Optional[int] = None) -> Tuple[int, int]:
+        return await self.run(self.db.calculate_score, user_id, quiz_id, attempt_id)
+    
+    async def calculate_scores(self, user_ids: List[int], quiz_id: int) -> Dict[int, Tuple[int, int]]:
+        return await self.run(self.db.calculate_scores, user_ids, quiz_id)
+    
+    async def get_quiz_stats(self, quiz_id: int) -> Dict:
+        return await self.run(self.db.get_quiz_stats, quiz_id)
+    
+    async def get_leaderboard(self, quiz_id: int, limit: Optional[int] = None) -> List[Dict]:
+        return await self.run(self.db.get_leaderboard, quiz_id, limit)
+    
+    async def get_user_scores(self, user_id: int) -> List[Dict]:
+        return await self.run(self.db.get_user_scores, user_id)
+    
+    async def get_user_scores_page(self, user_id: int, before: Optional[Tuple[str, int]] = None,
+                                   limit: int = 50) -> List[Dict]:
+        return await self.run(self.db.get_user_scores_page, user_id, before, limit)
+    
+    async def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        await asyncio.get_running_loop().run_in_executor(None, self.shutdown)
+    
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True)
+        if self.owns_db:
+            self.db.close()
@@ -1,15 +1,11 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Callable, Optional
-import hashlib
 from database import Database
 from styles import StyleManager
+from db_worker import DatabaseWorker
 
 class AuthWindow:
-    @staticmethod
-    def hash_password(password: str) -> str:
-        return hashlib.sha256(password.encode()).hexdigest()
-    
     def __init__(self, db: Database, on_success: Callable):
         self.db = db
         self.on_success = on_success
@@ -51,10 +47,16 @@ class AuthWindow:
         button_frame = ttk.Frame(login_frame)
         button_frame.grid(row=2, column=0, columnspan=2, pady=25)
         
-        ttk.Button(button_frame, text="Login", command=self.login, 
-                  style='Primary.TButton', width=15).pack(side=tk.LEFT, padx=10)
-        ttk.Button(button_frame, text="Register", command=self.register, 
-                  style='Success.TButton', width=15).pack(side=tk.LEFT, padx=10)
+        self.login_button = ttk.Button(button_frame, text="Login", command=self.login, 
+                                       style='Primary.TButton', width=15)
+        self.login_button.pack(side=tk.LEFT, padx=10)
+        self.register_button = ttk.Button(button_frame, text="Register", command=self.register, 
+                                          style='Success.TButton', width=15)
+        self.register_button.pack(side=tk.LEFT, padx=10)
+        
+        self.busy_bar = ttk.Progressbar(login_frame, mode='indeterminate')
+        self.busy_bar.grid(row=3, column=0, columnspan=2, sticky=tk.EW)
+        self.worker = DatabaseWorker(self.window, progress=self.busy_bar)
         
         info_label = ttk.Label(main_frame, 
                               text="Admin login: username='admin', password='admin'",
@@ -65,6 +67,9 @@ class AuthWindow:
         self.password_entry.bind("<Return>", lambda e: self.login())
     
     def login(self) -> None:
+        if self.worker.busy:
+            return
+        
         username = self.username_entry.get().strip()
         password = self.password_entry.get().strip()
         
@@ -72,18 +77,27 @@ class AuthWindow:
             messagebox.showerror("Error", "Please enter both username and password")
             return
         
-        hashed_password = self.hash_password(password)
-        user = self.db.authenticate_user(username, hashed_password)
-        if user:
+        self.set_buttons_state(tk.DISABLED)
+        self.worker.submit(self.db.login, username, password,
+                           on_success=self.on_login_finished, on_error=self.on_request_failed)
+    
+    def on_login_finished(self, session: Optional[dict]) -> None:
+        self.set_buttons_state(tk.NORMAL)
+        if session:
+            user = session["user"]
             self.current_user = user
             role_text = "Administrator" if user["role"] == "admin" else "User"
             messagebox.showinfo("Login Successful", f"Welcome {user['username']}!\nYou are logged in as: {role_text}")
+            self.worker.shutdown()
             self.window.destroy()
-            self.on_success(user)
+            self.on_success(session)
         else:
             messagebox.showerror("Error", "Invalid username or password.")
     
     def register(self) -> None:
+        if self.worker.busy:
+            return
+        
         username = self.username_entry.get().strip()
         password = self.password_entry.get().strip()
         
@@ -95,13 +109,22 @@ class AuthWindow:
             messagebox.showerror("Error", "Cannot register as 'admin'. Use the admin login instead.")
             return
         
-        try:
-            hashed_password = self.hash_password(password)
-            self.db.create_user(username, hashed_password, "user")
-            messagebox.showinfo("Success", "Registration successful! Please login.")
-            self.password_entry.delete(0, tk.END)
-        except ValueError as e:
-            messagebox.showerror("Error", str(e))
+        self.set_buttons_state(tk.DISABLED)
+        self.worker.submit(self.db.create_user, username, password, "user",
+                           on_success=self.on_register_finished, on_error=self.on_request_failed)
+    
+    def on_register_finished(self, user_id: int) -> None:
+        self.set_buttons_state(tk.NORMAL)
+        messagebox.showinfo("Success", "Registration successful! Please login.")
+        self.password_entry.delete(0, tk.END)
+    
+    def on_request_failed(self, error: Exception) -> None:
+        self.set_buttons_state(tk.NORMAL)
+        messagebox.showerror("Error", str(error))
+    
+    def set_buttons_state(self, state: str) -> None:
+        self.login_button.config(state=state)
+        self.register_button.config(state=state)
     
     def run(self) -> None:
         self.window.mainloop()
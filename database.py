@@ -1,18 +1,261 @@
+import re
 import sqlite3
-from typing import List, Dict, Optional, Tuple
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple, Callable, Iterable, Iterator
 from datetime import datetime
-import hashlib
+from passwords import PasswordHasher
+from sessions import RateLimiter, SessionStore
+from scoring import AnswerKey
+
+class PooledConnection(sqlite3.Connection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = None
+        self.checked_out = False
+    
+    def close(self) -> None:
+        if self.pool is None:
+            super().close()
+        elif self.checked_out:
+            self.checked_out = False
+            self.pool.release(self)
+    
+    def terminate(self) -> None:
+        self.pool = None
+        super().close()
+
+class ConnectionPool:
+    def __init__(self, connect: Callable[[], PooledConnection], size: int = 5):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.connect = connect
+        self.size = size
+        self.closed = False
+        self._idle: List[PooledConnection] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = weakref.WeakSet()
+    
+    def acquire(self) -> PooledConnection:
+        if self.closed:
+            raise sqlite3.ProgrammingError("Connection pool is closed")
+        
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        while conn is None or not self.is_healthy(conn):
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                conn = self.connect()
+                with self._lock:
+                    self._connections.add(conn)
+                break
+        
+        conn.pool = self
+        conn.checked_out = True
+        return conn
+    
+    def release(self, conn: PooledConnection) -> None:
+        if conn.in_transaction:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                conn.terminate()
+                return
+        
+        if self.closed:
+            conn.terminate()
+            return
+        
+        if getattr(self._local, "conn", None) is None:
+            self._local.conn = conn
+            return
+        
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        conn.terminate()
+    
+    def is_healthy(self, conn: PooledConnection) -> bool:
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            conn.terminate()
+            return False
+    
+    def close(self) -> None:
+        with self._lock:
+            self.closed = True
+            connections = list(self._connections)
+            self._idle = []
+        self._local = threading.local()
+        for conn in connections:
+            try:
+                conn.terminate()
+            except sqlite3.Error:
+                pass
+
+class LRUCache:
+    def __init__(self, max_size: int = 128):
+        self.max_size = max_size
+        self.version = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=None, stamp=None):
+        with self._lock:
+            if key not in self._items:
+                return default
+            item_stamp, value = self._items[key]
+            if item_stamp != stamp:
+                del self._items[key]
+                return default
+            self._items.move_to_end(key)
+            return value
+    
+    def put(self, key, value, version: Optional[int] = None, stamp=None) -> None:
+        with self._lock:
+            if self.max_size <= 0 or (version is not None and version != self.version):
+                return
+            self._items[key] = (stamp, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+    
+    def pop(self, key) -> None:
+        with self._lock:
+            self.version += 1
+            self._items.pop(key, None)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._items.clear()
+    
+    def __len__(self) -> int:
+        return len(self._items)
 
 class Database:
-    def __init__(self, db_path: str = "quiz.db"):
+    MAX_QUERY_PARAMS = 500
+    LEADERBOARD_SIZE = 10
+    LOGIN_FAILURES_PER_USER = 5
+    LOGIN_FAILURES_PER_SOURCE = 20
+    LOGIN_WINDOW = 60.0
+    HISTOGRAM_BUCKETS = 10
+    DEFAULT_PRAGMAS = {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+    }
+    
+    QUIZ_CONTENT_QUERY = """
+        SELECT qz.id, qz.title, qz.description,
+               q.id, q.question_text, q.question_type, q.points,
+               o.id, o.option_text, o.is_correct
+        FROM quizzes qz
+        LEFT JOIN questions q ON q.quiz_id = qz.id
+        LEFT JOIN options o ON o.question_id = q.id
+    """
+    TAKER_CONTENT_QUERY = """
+        SELECT qz.id, qz.title, qz.description,
+               q.id, q.question_text, q.question_type, q.points,
+               o.id, o.option_text
+        FROM quizzes qz
+        LEFT JOIN questions q ON q.quiz_id = qz.id
+        LEFT JOIN options o ON o.question_id = q.id
+        WHERE qz.id = ?
+        ORDER BY q.id, o.id
+    """
+    ANSWER_KEY_QUERY = """
+        SELECT q.id, q.question_type, q.points, o.id
+        FROM quizzes qz
+        LEFT JOIN questions q ON q.quiz_id = qz.id
+        LEFT JOIN options o ON o.question_id = q.id AND o.is_correct = 1
+        WHERE qz.id = ?
+        ORDER BY q.id, o.id
+    """
+    EXPORT_TABLES = {
+        "quiz_content": (
+            [("quiz_id", "int"), ("quiz_title", "text"), ("quiz_description", "text"),
+             ("question_id", "int"), ("question_text", "text"), ("question_type", "text"), ("points", "int"),
+             ("option_id", "int"), ("option_text", "text"), ("is_correct", "int")],
+            QUIZ_CONTENT_QUERY + " ORDER BY qz.id, q.id, o.id"
+        ),
+        "attempts": (
+            [("id", "int"), ("user_id", "int"), ("quiz_id", "int"), ("started_at", "text"), ("completed_at", "text")],
+            "SELECT id, user_id, quiz_id, started_at, completed_at FROM attempts ORDER BY id"
+        ),
+        "responses": (
+            [("id", "int"), ("attempt_id", "int"), ("user_id", "int"), ("question_id", "int"),
+             ("selected_option_id", "int"), ("response_time", "text")],
+            "SELECT id, attempt_id, user_id, question_id, selected_option_id, response_time FROM responses ORDER BY id"
+        ),
+        "scores": (
+            [("id", "int"), ("attempt_id", "int"), ("user_id", "int"), ("quiz_id", "int"),
+             ("score", "int"), ("total_points", "int"), ("completed_at", "text")],
+            "SELECT id, attempt_id, user_id, quiz_id, score, total_points, completed_at FROM scores ORDER BY id"
+        ),
+    }
+    
+    def __init__(self, db_path: str = "quiz.db", pool_size: int = 5, pragmas: Optional[Dict] = None,
+                 quiz_cache_size: int = 128, password_workers: int = 2, login_cache_size: int = 1024,
+                 session_ttl: float = 3600.0):
         self.db_path = db_path
+        self.pragmas = self.build_pragmas(pragmas or {})
+        self.quiz_cache = LRUCache(quiz_cache_size)
+        self.list_cache = LRUCache(quiz_cache_size)
+        self.answer_key_cache = LRUCache(quiz_cache_size)
+        self.taker_cache = LRUCache(quiz_cache_size)
+        self.passwords = PasswordHasher(max_workers=password_workers, cache_size=login_cache_size)
+        self.sessions = SessionStore(session_ttl)
+        self.user_login_limiter = RateLimiter(self.LOGIN_FAILURES_PER_USER, self.LOGIN_WINDOW)
+        self.source_login_limiter = RateLimiter(self.LOGIN_FAILURES_PER_SOURCE, self.LOGIN_WINDOW)
+        self.pool = ConnectionPool(self.open_connection, pool_size)
+        self.search_enabled = True
         self.init_database()
+        self.search_enabled = self.has_search_index()
     
-    def get_connection(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
+    @classmethod
+    def build_pragmas(cls, overrides: Dict) -> Dict:
+        unknown = set(overrides) - set(cls.DEFAULT_PRAGMAS)
+        if unknown:
+            raise ValueError(f"Unsupported pragma(s): {', '.join(sorted(unknown))}")
+        
+        pragmas = dict(cls.DEFAULT_PRAGMAS)
+        pragmas.update(overrides)
+        for name, value in pragmas.items():
+            if value is not None and not re.fullmatch(r"-?\w+", str(value)):
+                raise ValueError(f"Invalid value for pragma {name}: {value!r}")
+        return {name: value for name, value in pragmas.items() if value is not None}
+    
+    def __enter__(self) -> "Database":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def open_connection(self) -> PooledConnection:
+        conn = sqlite3.connect(self.db_path, factory=PooledConnection, check_same_thread=False)
         conn.isolation_level = "IMMEDIATE"
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
         return conn
     
+    def get_connection(self) -> sqlite3.Connection:
+        return self.pool.acquire()
+    
+    def close(self) -> None:
+        self.pool.close()
+        self.passwords.close()
+    
     def init_database(self) -> None:
         conn = self.get_connection()
         cursor = conn.cursor()
@@ -84,32 +327,376 @@ class Database:
             )
         """)
         
+        self.migrate(conn)
+        
         cursor.execute("SELECT COUNT(*) FROM users WHERE role = 'admin'")
         admin_count = cursor.fetchone()[0]
-        admin_password_hash = hashlib.sha256('admin'.encode()).hexdigest()
+        cursor.execute("SELECT COUNT(*) FROM users WHERE username = 'admin' AND password = 'admin'")
+        plaintext_admin = cursor.fetchone()[0]
         
         if admin_count == 0:
             cursor.execute("""
                 INSERT INTO users (username, password, role)
                 VALUES ('admin', ?, 'admin')
-            """, (admin_password_hash,))
-        else:
+            """, (self.passwords.hash("admin"),))
+        elif plaintext_admin:
             cursor.execute("""
                 UPDATE users 
                 SET password = ? 
-                WHERE username = 'admin' AND (password = 'admin' OR LENGTH(password) != 64)
-            """, (admin_password_hash,))
+                WHERE username = 'admin' AND password = 'admin'
+            """, (self.passwords.hash("admin"),))
         
         conn.commit()
         conn.close()
     
+    @staticmethod
+    def get_columns(cursor: sqlite3.Cursor, table: str) -> List[str]:
+        cursor.execute(f"PRAGMA table_info({table})")
+        return [row[1] for row in cursor.fetchall()]
+    
+    def get_migrations(self) -> List[Callable[[sqlite3.Cursor], None]]:
+        return [
+            self.migrate_attempts,
+            self.migrate_indexes,
+            self.migrate_search_index,
+            self.migrate_attempt_progress,
+            self.migrate_quiz_stats,
+            self.migrate_item_analysis,
+            self.migrate_analytics_aggregates,
+            self.migrate_quiz_versions,
+        ]
+    
+    def migrate(self, conn: sqlite3.Connection) -> None:
+        cursor = conn.cursor()
+        migrations = self.get_migrations()
+        while True:
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                version = cursor.execute("PRAGMA user_version").fetchone()[0]
+                if version >= len(migrations):
+                    conn.rollback()
+                    return
+                migrations[version](cursor)
+                cursor.execute(f"PRAGMA user_version = {version + 1}")
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise
+    
+    def migrate_attempts(self, cursor: sqlite3.Cursor) -> None:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS attempts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                quiz_id INTEGER NOT NULL,
+                started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                completed_at TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users(id),
+                FOREIGN KEY (quiz_id) REFERENCES quizzes(id)
+            )
+        """)
+        
+        if "attempt_id" not in self.get_columns(cursor, "scores"):
+            cursor.execute("ALTER TABLE scores ADD COLUMN attempt_id INTEGER REFERENCES attempts(id)")
+            cursor.execute("""
+                INSERT INTO attempts (id, user_id, quiz_id, started_at, completed_at)
+                SELECT id, user_id, quiz_id, completed_at, completed_at
+                FROM scores
+                ORDER BY id
+            """)
+            cursor.execute("UPDATE scores SET attempt_id = id")
+        
+        if "attempt_id" not in self.get_columns(cursor, "responses"):
+            cursor.execute("ALTER TABLE responses ADD COLUMN attempt_id INTEGER REFERENCES attempts(id)")
+            cursor.execute("""
+                UPDATE responses
+                SET attempt_id = (
+                    SELECT s.attempt_id
+                    FROM scores s
+                    JOIN questions q ON q.quiz_id = s.quiz_id
+                    WHERE q.id = responses.question_id
+                      AND s.user_id = responses.user_id
+                      AND s.completed_at >= responses.response_time
+                    ORDER BY s.completed_at, s.id
+                    LIMIT 1
+                )
+            """)
+        
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_responses_attempt ON responses(attempt_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_attempts_user_quiz ON attempts(user_id, quiz_id)")
+    
+    def migrate_indexes(self, cursor: sqlite3.Cursor) -> None:
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_responses_user_question ON responses(user_id, question_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_options_question ON options(question_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_questions_quiz ON questions(quiz_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_scores_user_completed ON scores(user_id, completed_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_scores_attempt ON scores(attempt_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_quizzes_title ON quizzes(title)")
+        cursor.execute("ANALYZE")
+    
+    def migrate_search_index(self, cursor: sqlite3.Cursor) -> None:
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS quiz_search USING fts5(
+                    title, description, questions, options,
+                    tokenize = 'unicode61 remove_diacritics 2',
+                    prefix = '2 3'
+                )
+            """)
+        except sqlite3.OperationalError:
+            return
+        cursor.execute("SELECT id FROM quizzes")
+        self.refresh_search_index(cursor, [row[0] for row in cursor.fetchall()])
+    
+    def migrate_attempt_progress(self, cursor: sqlite3.Cursor) -> None:
+        if "current_index" not in self.get_columns(cursor, "attempts"):
+            cursor.execute("ALTER TABLE attempts ADD COLUMN current_index INTEGER NOT NULL DEFAULT 0")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_responses_attempt_question ON responses(attempt_id, question_id)")
+    
+    def migrate_quiz_stats(self, cursor: sqlite3.Cursor) -> None:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS quiz_stats (
+                quiz_id INTEGER PRIMARY KEY,
+                attempt_count INTEGER NOT NULL DEFAULT 0,
+                score_sum INTEGER NOT NULL DEFAULT 0,
+                max_score INTEGER NOT NULL DEFAULT 0,
+                last_completed_at TIMESTAMP
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS quiz_score_histogram (
+                quiz_id INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                attempt_count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (quiz_id, bucket)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS quiz_leaderboard (
+                quiz_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                best_score INTEGER NOT NULL,
+                total_points INTEGER NOT NULL,
+                achieved_at TIMESTAMP NOT NULL,
+                PRIMARY KEY (quiz_id, user_id)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_quiz_leaderboard_rank
+            ON quiz_leaderboard(quiz_id, best_score DESC, achieved_at, user_id)
+        """)
+        
+        cursor.execute("""
+            INSERT INTO quiz_stats (quiz_id, attempt_count, score_sum, max_score, last_completed_at)
+            SELECT quiz_id, COUNT(*), SUM(score), MAX(score), MAX(completed_at)
+            FROM scores
+            GROUP BY quiz_id
+        """)
+        cursor.execute("""
+            INSERT INTO quiz_score_histogram (quiz_id, bucket, attempt_count)
+            SELECT quiz_id,
+                   CASE WHEN total_points > 0 THEN MIN(MAX(score, 0) * ? / total_points, ? - 1) ELSE 0 END AS bucket,
+                   COUNT(*)
+            FROM scores
+            GROUP BY quiz_id, bucket
+        """, (self.HISTOGRAM_BUCKETS, self.HISTOGRAM_BUCKETS))
+        cursor.execute("""
+            INSERT INTO quiz_leaderboard (quiz_id, user_id, best_score, total_points, achieved_at)
+            SELECT quiz_id, user_id, score, total_points, completed_at
+            FROM (
+                SELECT quiz_id, user_id, score, total_points, completed_at,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY quiz_id, user_id
+                           ORDER BY score DESC, completed_at, id
+                       ) AS user_rank
+                FROM scores
+            )
+            WHERE user_rank = 1
+        """)
+        cursor.execute("""
+            DELETE FROM quiz_leaderboard
+            WHERE (quiz_id, user_id) IN (
+                SELECT quiz_id, user_id
+                FROM (
+                    SELECT quiz_id, user_id,
+                           ROW_NUMBER() OVER (
+                               PARTITION BY quiz_id
+                               ORDER BY best_score DESC, achieved_at, user_id
+                           ) AS board_rank
+                    FROM quiz_leaderboard
+                )
+                WHERE board_rank > ?
+            )
+        """, (self.LEADERBOARD_SIZE,))
+    
+    def migrate_item_analysis(self, cursor: sqlite3.Cursor) -> None:
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_responses_attempt_question_option
+            ON responses(attempt_id, question_id, selected_option_id)
+        """)
+        cursor.execute("DROP INDEX IF EXISTS idx_responses_attempt_question")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_scores_quiz ON scores(quiz_id)")
+    
+    def migrate_analytics_aggregates(self, cursor: sqlite3.Cursor) -> None:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS analytics_state (
+                source TEXT PRIMARY KEY,
+                last_id INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS quiz_daily_aggregates (
+                quiz_id INTEGER NOT NULL,
+                day TEXT NOT NULL,
+                attempt_count INTEGER NOT NULL DEFAULT 0,
+                score_sum INTEGER NOT NULL DEFAULT 0,
+                points_sum INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (quiz_id, day)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS question_aggregates (
+                question_id INTEGER PRIMARY KEY,
+                quiz_id INTEGER NOT NULL,
+                answered INTEGER NOT NULL DEFAULT 0,
+                correct INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_question_aggregates_quiz ON question_aggregates(quiz_id)")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS option_aggregates (
+                option_id INTEGER PRIMARY KEY,
+                question_id INTEGER NOT NULL,
+                selected INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_option_aggregates_question ON option_aggregates(question_id)")
+    
+    def migrate_quiz_versions(self, cursor: sqlite3.Cursor) -> None:
+        if "version" not in self.get_columns(cursor, "quizzes"):
+            cursor.execute("ALTER TABLE quizzes ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+    
+    def has_search_index(self) -> bool:
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'quiz_search'")
+        exists = cursor.fetchone() is not None
+        conn.close()
+        return exists
+    
+    def refresh_search_index(self, cursor: sqlite3.Cursor, quiz_ids: List[Optional[int]]) -> None:
+        if not self.search_enabled:
+            return
+        
+        quiz_ids = [quiz_id for quiz_id in dict.fromkeys(quiz_ids) if quiz_id is not None]
+        for start in range(0, len(quiz_ids), self.MAX_QUERY_PARAMS):
+            chunk = quiz_ids[start:start + self.MAX_QUERY_PARAMS]
+            placeholders = ", ".join("?" * len(chunk))
+            cursor.execute(f"DELETE FROM quiz_search WHERE rowid IN ({placeholders})", chunk)
+            cursor.execute(f"""
+                INSERT INTO quiz_search (rowid, title, description, questions, options)
+                SELECT qz.id, qz.title, COALESCE(qz.description, ''),
+                       COALESCE((SELECT group_concat(q.question_text, ' ')
+                                 FROM questions q WHERE q.quiz_id = qz.id), ''),
+                       COALESCE((SELECT group_concat(o.option_text, ' ')
+                                 FROM options o JOIN questions q ON q.id = o.question_id
+                                 WHERE q.quiz_id = qz.id), '')
+                FROM quizzes qz
+                WHERE qz.id IN ({placeholders})
+            """, chunk)
+    
+    def invalidate_quiz(self, quiz_id: Optional[int], lists: bool = False) -> None:
+        if quiz_id is not None:
+            self.quiz_cache.pop(quiz_id)
+            self.answer_key_cache.pop(quiz_id)
+            self.taker_cache.pop(quiz_id)
+            self.taker_cache.pop(("outline", quiz_id))
+            self.taker_cache.pop(("bodies", quiz_id))
+        if lists:
+            self.list_cache.clear()
+    
+    @staticmethod
+    def bump_quiz_version(cursor: sqlite3.Cursor, quiz_id: Optional[int]) -> None:
+        cursor.execute("UPDATE quizzes SET version = version + 1 WHERE id = ?", (quiz_id,))
+    
+    @staticmethod
+    def get_quiz_version(cursor: sqlite3.Cursor, quiz_id: int) -> Optional[int]:
+        cursor.execute("SELECT version FROM quizzes WHERE id = ?", (quiz_id,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+    
+    def get_quiz_versions(self, cursor: sqlite3.Cursor, quiz_ids: List[int]) -> Dict[int, int]:
+        versions = {}
+        for start in range(0, len(quiz_ids), self.MAX_QUERY_PARAMS):
+            chunk = quiz_ids[start:start + self.MAX_QUERY_PARAMS]
+            placeholders = ", ".join("?" * len(chunk))
+            cursor.execute(f"SELECT id, version FROM quizzes WHERE id IN ({placeholders})", chunk)
+            versions.update(cursor.fetchall())
+        return versions
+    
+    @staticmethod
+    def get_question_quiz_id(cursor: sqlite3.Cursor, question_id: int) -> Optional[int]:
+        cursor.execute("SELECT quiz_id FROM questions WHERE id = ?", (question_id,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+    
     def authenticate_user(self, username: str, password: str) -> Optional[Dict]:
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT id, username, role, password FROM users
+            WHERE username = ?
+        """, (username,))
+        result = cursor.fetchone()
+        conn.close()
+        if not result:
+            self.passwords.verify(password, self.passwords.dummy_hash)
+            return None
+        if not self.passwords.verify(password, result[3]):
+            return None
+        if self.passwords.needs_rehash(result[3]):
+            self.upgrade_password_hash(result[0], result[3], self.passwords.hash(password))
+        return {"id": result[0], "username": result[1], "role": result[2]}
+    
+    def login(self, username: str, password: str, source: str = "local") -> Optional[Dict]:
+        self.user_login_limiter.check((username, source), "Too many failed logins for this account.")
+        self.source_login_limiter.check(source, "Too many failed logins from this address.")
+        user = self.authenticate_user(username, password)
+        if not user:
+            self.user_login_limiter.hit((username, source))
+            self.source_login_limiter.hit(source)
+            return None
+        self.user_login_limiter.reset((username, source))
+        return {"token": self.sessions.create(user), "user": user}
+    
+    def get_session_user(self, token: str) -> Optional[Dict]:
+        return self.sessions.get(token)
+    
+    def logout(self, token: str) -> None:
+        self.sessions.revoke(token)
+    
+    def upgrade_password_hash(self, user_id: int, old_hash: str, new_hash: str) -> None:
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                UPDATE users SET password = ?
+                WHERE id = ? AND password = ?
+            """, (new_hash, user_id, old_hash))
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            conn.rollback()
+            conn.close()
+            raise
+    
+    def get_user_by_username(self, username: str) -> Optional[Dict]:
         conn = self.get_connection()
         cursor = conn.cursor()
         cursor.execute("""
             SELECT id, username, role FROM users
-            WHERE username = ? AND password = ?
-        """, (username, password))
+            WHERE username = ?
+        """, (username,))
         result = cursor.fetchone()
         conn.close()
         if result:
@@ -117,13 +704,14 @@ class Database:
         return None
     
     def create_user(self, username: str, password: str, role: str = "user") -> int:
+        password_hash = self.passwords.hash(password)
         conn = self.get_connection()
         cursor = conn.cursor()
         try:
             cursor.execute("""
                 INSERT INTO users (username, password, role)
                 VALUES (?, ?, ?)
-            """, (username, password, role))
+            """, (username, password_hash, role))
             conn.commit()
             user_id = cursor.lastrowid
             conn.close()
@@ -140,9 +728,11 @@ class Database:
                 INSERT INTO quizzes (title, description, created_by)
                 VALUES (?, ?, ?)
             """, (title, description, created_by))
-            conn.commit()
             quiz_id = cursor.lastrowid
+            self.refresh_search_index(cursor, [quiz_id])
+            conn.commit()
             conn.close()
+            self.invalidate_quiz(None, lists=True)
             return quiz_id
         except Exception as e:
             conn.rollback()
@@ -158,8 +748,11 @@ class Database:
                 SET title = ?, description = ?
                 WHERE id = ?
             """, (title, description, quiz_id))
+            self.bump_quiz_version(cursor, quiz_id)
+            self.refresh_search_index(cursor, [quiz_id])
             conn.commit()
             conn.close()
+            self.invalidate_quiz(quiz_id, lists=True)
         except Exception as e:
             conn.rollback()
             conn.close()
@@ -173,9 +766,12 @@ class Database:
                 INSERT INTO questions (quiz_id, question_text, question_type, points)
                 VALUES (?, ?, ?, ?)
             """, (quiz_id, question_text, question_type, points))
-            conn.commit()
             question_id = cursor.lastrowid
+            self.bump_quiz_version(cursor, quiz_id)
+            self.refresh_search_index(cursor, [quiz_id])
+            conn.commit()
             conn.close()
+            self.invalidate_quiz(quiz_id)
             return question_id
         except Exception as e:
             conn.rollback()
@@ -186,13 +782,17 @@ class Database:
         conn = self.get_connection()
         cursor = conn.cursor()
         try:
+            quiz_id = self.get_question_quiz_id(cursor, question_id)
             cursor.execute("""
                 UPDATE questions
                 SET question_text = ?, question_type = ?, points = ?
                 WHERE id = ?
             """, (question_text, question_type, points, question_id))
+            self.bump_quiz_version(cursor, quiz_id)
+            self.refresh_search_index(cursor, [quiz_id])
             conn.commit()
             conn.close()
+            self.invalidate_quiz(quiz_id)
         except Exception as e:
             conn.rollback()
             conn.close()
@@ -202,13 +802,17 @@ class Database:
         conn = self.get_connection()
         cursor = conn.cursor()
         try:
+            quiz_id = self.get_question_quiz_id(cursor, question_id)
             cursor.execute("""
                 INSERT INTO options (question_id, option_text, is_correct)
                 VALUES (?, ?, ?)
             """, (question_id, option_text, is_correct))
-            conn.commit()
             option_id = cursor.lastrowid
+            self.bump_quiz_version(cursor, quiz_id)
+            self.refresh_search_index(cursor, [quiz_id])
+            conn.commit()
             conn.close()
+            self.invalidate_quiz(quiz_id)
             return option_id
         except Exception as e:
             conn.rollback()
@@ -240,8 +844,12 @@ class Database:
                     VALUES (?, ?, ?)
                 """, (question_id, opt["text"], 1 if opt["is_correct"] else 0))
             
+            self.bump_quiz_version(cursor, quiz_id)
+            self.refresh_search_index(cursor, [quiz_id])
             conn.commit()
             conn.close()
+            self.invalidate_quiz(quiz_id)
+            self.get_answer_key(quiz_id)
             return question_id
         except Exception as e:
             conn.rollback()
@@ -249,6 +857,11 @@ class Database:
             raise
     
     def get_all_quizzes(self) -> List[Dict]:
+        version = self.list_cache.version
+        quizzes = self.list_cache.get("all")
+        if quizzes is not None:
+            return quizzes
+        
         conn = self.get_connection()
         cursor = conn.cursor()
         cursor.execute("""
@@ -265,84 +878,341 @@ class Database:
                 "created_at": row[3]
             })
         conn.close()
+        self.list_cache.put("all", quizzes, version)
+        return quizzes
+    
+    def get_quizzes_page(self, after: Optional[Tuple[str, int]] = None, limit: int = 50) -> List[Dict]:
+        key = ("page", after, limit)
+        version = self.list_cache.version
+        quizzes = self.list_cache.get(key)
+        if quizzes is not None:
+            return quizzes
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        if after is None:
+            cursor.execute("""
+                SELECT id, title, description, created_at
+                FROM quizzes
+                ORDER BY title ASC, id ASC
+                LIMIT ?
+            """, (limit,))
+        else:
+            cursor.execute("""
+                SELECT id, title, description, created_at
+                FROM quizzes
+                WHERE (title, id) > (?, ?)
+                ORDER BY title ASC, id ASC
+                LIMIT ?
+            """, (after[0], after[1], limit))
+        quizzes = []
+        for row in cursor.fetchall():
+            quizzes.append({
+                "id": row[0],
+                "title": row[1],
+                "description": row[2],
+                "created_at": row[3]
+            })
+        conn.close()
+        self.list_cache.put(key, quizzes, version)
+        return quizzes
+    
+    def search_quizzes(self, query: str, limit: int = 20) -> List[Dict]:
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            return []
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        if self.search_enabled:
+            match = " ".join('"' + term + '"*' for term in terms)
+            cursor.execute("""
+                SELECT qz.id, qz.title, qz.description, qz.created_at
+                FROM quiz_search
+                JOIN quizzes qz ON qz.id = quiz_search.rowid
+                WHERE quiz_search MATCH ?
+                ORDER BY bm25(quiz_search, 10.0, 4.0, 2.0, 1.0), qz.title
+                LIMIT ?
+            """, (match, limit))
+        else:
+            pattern = "%" + " ".join(terms) + "%"
+            cursor.execute("""
+                SELECT id, title, description, created_at
+                FROM quizzes
+                WHERE title LIKE ? OR description LIKE ?
+                ORDER BY title ASC, id ASC
+                LIMIT ?
+            """, (pattern, pattern, limit))
+        quizzes = []
+        for row in cursor.fetchall():
+            quizzes.append({
+                "id": row[0],
+                "title": row[1],
+                "description": row[2],
+                "created_at": row[3]
+            })
+        conn.close()
         return quizzes
     
     def get_quiz_with_questions(self, quiz_id: int) -> Optional[Dict]:
+        return self.get_quizzes_with_questions([quiz_id]).get(quiz_id)
+    
+    def get_quizzes_with_questions(self, quiz_ids: List[int]) -> Dict[int, Dict]:
+        version = self.quiz_cache.version
+        key_version = self.answer_key_cache.version
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id, title, description
-            FROM quizzes WHERE id = ?
-        """, (quiz_id,))
-        quiz_row = cursor.fetchone()
-        if not quiz_row:
+        quiz_ids = list(dict.fromkeys(quiz_ids))
+        stamps = self.get_quiz_versions(cursor, quiz_ids)
+        quizzes = {}
+        missing = []
+        for quiz_id in quiz_ids:
+            if quiz_id not in stamps:
+                continue
+            quiz = self.quiz_cache.get(quiz_id, stamp=stamps[quiz_id])
+            if quiz is not None:
+                quizzes[quiz_id] = quiz
+            else:
+                missing.append(quiz_id)
+        
+        for start in range(0, len(missing), self.MAX_QUERY_PARAMS):
+            chunk = missing[start:start + self.MAX_QUERY_PARAMS]
+            placeholders = ", ".join("?" * len(chunk))
+            cursor.execute(f"""
+                {self.QUIZ_CONTENT_QUERY}
+                WHERE qz.id IN ({placeholders})
+                ORDER BY qz.id, q.id, o.id
+            """, chunk)
+            for quiz in self.assemble_quizzes(cursor):
+                quizzes[quiz["id"]] = quiz
+                self.quiz_cache.put(quiz["id"], quiz, version, stamps[quiz["id"]])
+                self.answer_key_cache.put(quiz["id"], AnswerKey.from_quiz(quiz), key_version, stamps[quiz["id"]])
+        conn.close()
+        return quizzes
+    
+    def get_quiz_for_taker(self, quiz_id: int) -> Optional[Dict]:
+        version = self.taker_cache.version
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        stamp = self.get_quiz_version(cursor, quiz_id)
+        if stamp is None:
             conn.close()
             return None
         
-        quiz = {
-            "id": quiz_row[0],
-            "title": quiz_row[1],
-            "description": quiz_row[2],
-            "questions": []
-        }
+        quiz = self.taker_cache.get(quiz_id, stamp=stamp)
+        if quiz is None:
+            cursor.execute(self.TAKER_CONTENT_QUERY, (quiz_id,))
+            quiz = next(self.assemble_quizzes(cursor, with_answers=False), None)
+            if quiz is not None:
+                self.taker_cache.put(quiz_id, quiz, version, stamp)
+        conn.close()
+        return quiz
+    
+    def get_quiz_outline(self, quiz_id: int) -> Optional[Dict]:
+        version = self.taker_cache.version
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        stamp = self.get_quiz_version(cursor, quiz_id)
+        outline = None
+        if stamp is not None:
+            outline = self.taker_cache.get(("outline", quiz_id), stamp=stamp)
+            if outline is None:
+                outline = self.load_quiz_outline(cursor, quiz_id, stamp)
+                if outline is not None:
+                    self.taker_cache.put(("outline", quiz_id), outline, version, stamp)
+        conn.close()
+        if outline is None:
+            return None
+        return {**outline, "questions": [dict(question) for question in outline["questions"]]}
+    
+    def load_quiz_outline(self, cursor: sqlite3.Cursor, quiz_id: int, stamp: int) -> Optional[Dict]:
+        quiz = self.taker_cache.get(quiz_id, stamp=stamp)
+        if quiz is not None:
+            return {
+                "id": quiz["id"],
+                "title": quiz["title"],
+                "description": quiz["description"],
+                "questions": [
+                    {"id": question["id"], "question_type": question["question_type"], "points": question["points"]}
+                    for question in quiz["questions"]
+                ]
+            }
         
         cursor.execute("""
-            SELECT id, question_text, question_type, points
-            FROM questions WHERE quiz_id = ?
-            ORDER BY id
+            SELECT qz.id, qz.title, qz.description, q.id, q.question_type, q.points
+            FROM quizzes qz
+            LEFT JOIN questions q ON q.quiz_id = qz.id
+            WHERE qz.id = ?
+            ORDER BY q.id
         """, (quiz_id,))
+        rows = cursor.fetchall()
+        if not rows:
+            return None
+        return {
+            "id": rows[0][0],
+            "title": rows[0][1],
+            "description": rows[0][2],
+            "questions": [
+                {"id": row[3], "question_type": row[4], "points": row[5]}
+                for row in rows if row[3] is not None
+            ]
+        }
+    
+    def get_question_bodies(self, quiz_id: int, question_ids: List[int]) -> Dict[int, Dict]:
+        question_ids = list(dict.fromkeys(question_ids))
+        version = self.taker_cache.version
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        stamp = self.get_quiz_version(cursor, quiz_id)
+        if stamp is None:
+            conn.close()
+            return {}
         
-        for q_row in cursor.fetchall():
-            question = {
-                "id": q_row[0],
-                "question_text": q_row[1],
-                "question_type": q_row[2],
-                "points": q_row[3],
-                "options": []
+        quiz = self.taker_cache.get(quiz_id, stamp=stamp)
+        if quiz is not None:
+            conn.close()
+            bodies = {
+                question["id"]: {"question_text": question["question_text"], "options": question["options"]}
+                for question in quiz["questions"]
             }
+            return {question_id: bodies[question_id] for question_id in question_ids if question_id in bodies}
+        
+        cached = self.taker_cache.get(("bodies", quiz_id), {}, stamp=stamp)
+        missing = [question_id for question_id in question_ids if question_id not in cached]
+        bodies = {}
+        for start in range(0, len(missing), self.MAX_QUERY_PARAMS):
+            chunk = missing[start:start + self.MAX_QUERY_PARAMS]
+            placeholders = ", ".join("?" * len(chunk))
+            cursor.execute(f"""
+                SELECT q.id, q.question_text, o.id, o.option_text
+                FROM questions q
+                LEFT JOIN options o ON o.question_id = q.id
+                WHERE q.quiz_id = ? AND q.id IN ({placeholders})
+                ORDER BY q.id, o.id
+            """, [quiz_id, *chunk])
+            for question_id, question_text, option_id, option_text in cursor.fetchall():
+                body = bodies.setdefault(question_id, {"question_text": question_text, "options": []})
+                if option_id is not None:
+                    body["options"].append({"id": option_id, "option_text": option_text})
+        conn.close()
+        if bodies:
+            bodies = {**cached, **bodies}
+            self.taker_cache.put(("bodies", quiz_id), bodies, version, stamp)
+        else:
+            bodies = cached
+        return {question_id: bodies[question_id] for question_id in question_ids if question_id in bodies}
+    
+    def get_answer_key(self, quiz_id: int) -> Optional[AnswerKey]:
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        answer_key = self.read_answer_key(cursor, quiz_id)
+        conn.close()
+        return answer_key
+    
+    def read_answer_key(self, cursor: sqlite3.Cursor, quiz_id: int) -> Optional[AnswerKey]:
+        version = self.answer_key_cache.version
+        stamp = self.get_quiz_version(cursor, quiz_id)
+        if stamp is None:
+            return None
+        
+        answer_key = self.answer_key_cache.get(quiz_id, stamp=stamp)
+        if answer_key is None:
+            cursor.execute(self.ANSWER_KEY_QUERY, (quiz_id,))
+            answer_key = AnswerKey.from_rows(quiz_id, cursor.fetchall())
+            self.answer_key_cache.put(quiz_id, answer_key, version, stamp)
+        return answer_key
+    
+    def grade_responses(self, quiz_id: int, responses: Dict[int, List[int]]) -> Tuple[int, int]:
+        answer_key = self.get_answer_key(quiz_id)
+        if answer_key is None:
+            raise ValueError("Quiz not found")
+        return answer_key.grade(responses)
+    
+    def iter_quizzes_with_questions(self, batch_size: int = 1000) -> Iterator[Dict]:
+        return self.assemble_quizzes(self.iter_export_rows("quiz_content", batch_size))
+    
+    def iter_export_rows(self, table: str, batch_size: int = 1000) -> Iterator[Tuple]:
+        if table not in self.EXPORT_TABLES:
+            raise ValueError(f"Unknown export table: {table}")
+        
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.arraysize = batch_size
+            cursor.execute(self.EXPORT_TABLES[table][1])
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def assemble_quizzes(rows, with_answers: bool = True):
+        quiz = None
+        question = None
+        for row in rows:
+            if quiz is None or quiz["id"] != row[0]:
+                if quiz is not None:
+                    yield quiz
+                quiz = {
+                    "id": row[0],
+                    "title": row[1],
+                    "description": row[2],
+                    "questions": []
+                }
+                question = None
             
-            cursor.execute("""
-                SELECT id, option_text, is_correct
-                FROM options WHERE question_id = ?
-                ORDER BY id
-            """, (question["id"],))
-            
-            for opt_row in cursor.fetchall():
-                question["options"].append({
-                    "id": opt_row[0],
-                    "option_text": opt_row[1],
-                    "is_correct": bool(opt_row[2])
-                })
+            if row[3] is None:
+                continue
+            if question is None or question["id"] != row[3]:
+                question = {
+                    "id": row[3],
+                    "question_text": row[4],
+                    "question_type": row[5],
+                    "points": row[6],
+                    "options": []
+                }
+                quiz["questions"].append(question)
             
-            quiz["questions"].append(question)
+            if row[7] is not None:
+                option = {
+                    "id": row[7],
+                    "option_text": row[8]
+                }
+                if with_answers:
+                    option["is_correct"] = bool(row[9])
+                question["options"].append(option)
         
-        conn.close()
-        return quiz
+        if quiz is not None:
+            yield quiz
     
-    def save_response(self, user_id: int, question_id: int, selected_option_id: int) -> None:
+    def start_attempt(self, user_id: int, quiz_id: int) -> int:
         conn = self.get_connection()
         cursor = conn.cursor()
         try:
             cursor.execute("""
-                INSERT INTO responses (user_id, question_id, selected_option_id)
-                VALUES (?, ?, ?)
-            """, (user_id, question_id, selected_option_id))
+                INSERT INTO attempts (user_id, quiz_id)
+                VALUES (?, ?)
+            """, (user_id, quiz_id))
             conn.commit()
+            attempt_id = cursor.lastrowid
             conn.close()
+            return attempt_id
         except Exception as e:
             conn.rollback()
             conn.close()
             raise
     
-    def save_all_responses(self, user_id: int, responses: List[Tuple[int, int]]) -> None:
+    def save_response(self, user_id: int, question_id: int, selected_option_id: int, attempt_id: int) -> None:
         conn = self.get_connection()
         cursor = conn.cursor()
         try:
-            for question_id, selected_option_id in responses:
-                cursor.execute("""
-                    INSERT INTO responses (user_id, question_id, selected_option_id)
-                    VALUES (?, ?, ?)
-                """, (user_id, question_id, selected_option_id))
+            cursor.execute("""
+                INSERT INTO responses (user_id, question_id, selected_option_id, attempt_id)
+                VALUES (?, ?, ?, ?)
+            """, (user_id, question_id, selected_option_id, attempt_id))
             conn.commit()
             conn.close()
         except Exception as e:
@@ -350,58 +1220,360 @@ class Database:
             conn.close()
             raise
     
-    def calculate_score(self, user_id: int, quiz_id: int) -> Tuple[int, int]:
+    def save_all_responses(self, user_id: int, responses: List[Tuple[int, int]], attempt_id: int) -> None:
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.executemany("""
+                INSERT INTO responses (user_id, question_id, selected_option_id, attempt_id)
+                VALUES (?, ?, ?, ?)
+            """, [(user_id, question_id, selected_option_id, attempt_id)
+                  for question_id, selected_option_id in responses])
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            conn.rollback()
+            conn.close()
+            raise
+    
+    def get_attempt_responses(self, attempt_id: int) -> Dict[int, List[int]]:
         conn = self.get_connection()
         cursor = conn.cursor()
-        
         cursor.execute("""
-            SELECT q.id, q.question_type, q.points
-            FROM questions q
-            WHERE q.quiz_id = ?
-        """, (quiz_id,))
-        
-        questions = cursor.fetchall()
-        total_points = sum(q[2] for q in questions)
-        earned_points = 0
-        
-        for question_id, question_type, points in questions:
+            SELECT question_id, selected_option_id
+            FROM responses
+            WHERE attempt_id = ?
+            ORDER BY id
+        """, (attempt_id,))
+        responses = {}
+        for question_id, option_id in cursor.fetchall():
+            responses.setdefault(question_id, []).append(option_id)
+        conn.close()
+        return responses
+    
+    def get_open_attempt(self, user_id: int, quiz_id: int) -> Optional[Dict]:
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT id, started_at, current_index
+            FROM attempts
+            WHERE user_id = ? AND quiz_id = ? AND completed_at IS NULL
+            ORDER BY id DESC
+            LIMIT 1
+        """, (user_id, quiz_id))
+        row = cursor.fetchone()
+        conn.close()
+        if not row:
+            return None
+        return {
+            "id": row[0],
+            "started_at": row[1],
+            "current_index": row[2],
+            "responses": self.get_attempt_responses(row[0])
+        }
+    
+    def save_attempt_progress(self, attempt_id: int, responses: Dict[int, List[int]],
+                              current_index: Optional[int] = None) -> None:
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        try:
             cursor.execute("""
-                SELECT o.id, o.is_correct
-                FROM options o
-                WHERE o.question_id = ?
-            """, (question_id,))
-            options = cursor.fetchall()
+                SELECT user_id FROM attempts
+                WHERE id = ? AND completed_at IS NULL
+            """, (attempt_id,))
+            row = cursor.fetchone()
+            if not row:
+                raise ValueError("Attempt is not open")
+            user_id = row[0]
             
+            question_ids = list(responses)
+            for start in range(0, len(question_ids), self.MAX_QUERY_PARAMS):
+                chunk = question_ids[start:start + self.MAX_QUERY_PARAMS]
+                placeholders = ", ".join("?" * len(chunk))
+                cursor.execute(f"""
+                    DELETE FROM responses
+                    WHERE attempt_id = ? AND question_id IN ({placeholders})
+                """, [attempt_id] + chunk)
+            cursor.executemany("""
+                INSERT INTO responses (user_id, question_id, selected_option_id, attempt_id)
+                VALUES (?, ?, ?, ?)
+            """, [
+                (user_id, question_id, option_id, attempt_id)
+                for question_id, selected_options in responses.items()
+                for option_id in dict.fromkeys(selected_options)
+            ])
+            if current_index is not None:
+                cursor.execute("UPDATE attempts SET current_index = ? WHERE id = ?", (current_index, attempt_id))
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            conn.rollback()
+            conn.close()
+            raise
+    
+    def discard_attempt(self, attempt_id: int) -> None:
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        try:
             cursor.execute("""
-                SELECT selected_option_id
-                FROM responses
-                WHERE user_id = ? AND question_id = ?
-            """, (user_id, question_id))
-            user_responses = [r[0] for r in cursor.fetchall()]
-            
-            if question_type == "single_choice":
-                correct_option = next((opt[0] for opt in options if opt[1] == 1), None)
-                if correct_option and correct_option in user_responses:
-                    earned_points += points
-            else:
-                correct_options = {opt[0] for opt in options if opt[1] == 1}
-                user_selected = set(user_responses)
-                if correct_options and user_selected == correct_options:
-                    earned_points += points
+                DELETE FROM responses
+                WHERE attempt_id = ?
+                  AND attempt_id IN (SELECT id FROM attempts WHERE completed_at IS NULL)
+            """, (attempt_id,))
+            cursor.execute("DELETE FROM attempts WHERE id = ? AND completed_at IS NULL", (attempt_id,))
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            conn.rollback()
+            conn.close()
+            raise
+    
+    def calculate_score(self, user_id: int, quiz_id: int, attempt_id: Optional[int] = None) -> Tuple[int, int]:
+        if attempt_id is None:
+            return self.calculate_scores([user_id], quiz_id)[user_id]
         
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        total_points = self.get_total_points(cursor, quiz_id)
+        earned = self.score_attempts(cursor, quiz_id, [attempt_id])
         conn.close()
-        return earned_points, total_points
+        return earned[attempt_id], total_points
     
-    def save_score(self, user_id: int, quiz_id: int, score: int, total_points: int) -> None:
+    def calculate_scores(self, user_ids: List[int], quiz_id: int) -> Dict[int, Tuple[int, int]]:
+        user_ids = list(dict.fromkeys(user_ids))
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        total_points = self.get_total_points(cursor, quiz_id)
+        
+        latest_attempts = {}
+        for start in range(0, len(user_ids), self.MAX_QUERY_PARAMS):
+            chunk = user_ids[start:start + self.MAX_QUERY_PARAMS]
+            placeholders = ", ".join("?" * len(chunk))
+            cursor.execute(f"""
+                SELECT user_id, MAX(id)
+                FROM attempts
+                WHERE quiz_id = ? AND user_id IN ({placeholders}) AND completed_at IS NOT NULL
+                GROUP BY user_id
+            """, [quiz_id] + chunk)
+            latest_attempts.update(cursor.fetchall())
+        
+        earned = self.score_attempts(cursor, quiz_id, list(latest_attempts.values()))
+        conn.close()
+        return {
+            user_id: (earned.get(latest_attempts.get(user_id), 0), total_points)
+            for user_id in user_ids
+        }
+    
+    @staticmethod
+    def get_total_points(cursor: sqlite3.Cursor, quiz_id: int) -> int:
+        cursor.execute("SELECT COALESCE(SUM(points), 0) FROM questions WHERE quiz_id = ?", (quiz_id,))
+        return cursor.fetchone()[0]
+    
+    def score_attempts(self, cursor: sqlite3.Cursor, quiz_id: int, attempt_ids: List[int]) -> Dict[int, int]:
+        earned = {attempt_id: 0 for attempt_id in attempt_ids}
+        for start in range(0, len(attempt_ids), self.MAX_QUERY_PARAMS):
+            chunk = attempt_ids[start:start + self.MAX_QUERY_PARAMS]
+            placeholders = ", ".join("?" * len(chunk))
+            cursor.execute(f"""
+                WITH answer_key AS (
+                    SELECT q.id AS question_id, q.question_type, q.points,
+                           MIN(CASE WHEN o.is_correct = 1 THEN o.id END) AS first_correct_id,
+                           COALESCE(SUM(o.is_correct), 0) AS correct_count
+                    FROM questions q
+                    LEFT JOIN options o ON o.question_id = q.id
+                    WHERE q.quiz_id = ?
+                    GROUP BY q.id
+                ),
+                selections AS (
+                    SELECT DISTINCT r.attempt_id, r.question_id, r.selected_option_id
+                    FROM responses r
+                    JOIN answer_key k ON k.question_id = r.question_id
+                    WHERE r.attempt_id IN ({placeholders})
+                ),
+                graded AS (
+                    SELECT s.attempt_id, s.question_id,
+                           COUNT(*) AS selected_count,
+                           COALESCE(SUM(o.is_correct), 0) AS selected_correct,
+                           MAX(s.selected_option_id = k.first_correct_id) AS has_first_correct
+                    FROM selections s
+                    JOIN answer_key k ON k.question_id = s.question_id
+                    LEFT JOIN options o ON o.id = s.selected_option_id AND o.question_id = s.question_id
+                    GROUP BY s.attempt_id, s.question_id
+                )
+                SELECT g.attempt_id,
+                       SUM(CASE
+                           WHEN k.question_type = 'single_choice' AND g.selected_count = 1 AND g.has_first_correct THEN k.points
+                           WHEN k.question_type = 'multiple_choice' AND k.correct_count > 0
+                                AND g.selected_correct = k.correct_count
+                                AND g.selected_count = k.correct_count THEN k.points
+                           ELSE 0
+                       END)
+                FROM graded g
+                JOIN answer_key k ON k.question_id = g.question_id
+                GROUP BY g.attempt_id
+            """, [quiz_id] + chunk)
+            earned.update(cursor.fetchall())
+        return earned
+    
+    def save_score(self, user_id: int, quiz_id: int, score: int, total_points: int, attempt_id: int) -> None:
         conn = self.get_connection()
         cursor = conn.cursor()
         try:
+            self.record_score(cursor, user_id, quiz_id, score, total_points, attempt_id)
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            conn.rollback()
+            conn.close()
+            raise
+    
+    @classmethod
+    def record_score(cls, cursor: sqlite3.Cursor, user_id: int, quiz_id: int, score: int,
+                     total_points: int, attempt_id: int) -> None:
+        cursor.execute("""
+            INSERT INTO scores (user_id, quiz_id, score, total_points, attempt_id)
+            VALUES (?, ?, ?, ?, ?)
+        """, (user_id, quiz_id, score, total_points, attempt_id))
+        cursor.execute("""
+            UPDATE attempts
+            SET completed_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """, (attempt_id,))
+        cls.update_quiz_stats(cursor, user_id, quiz_id, score, total_points)
+    
+    @classmethod
+    def update_quiz_stats(cls, cursor: sqlite3.Cursor, user_id: int, quiz_id: int, score: int,
+                          total_points: int) -> None:
+        cursor.execute("""
+            INSERT INTO quiz_stats (quiz_id, attempt_count, score_sum, max_score, last_completed_at)
+            VALUES (?, 1, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT (quiz_id) DO UPDATE SET
+                attempt_count = attempt_count + 1,
+                score_sum = score_sum + excluded.score_sum,
+                max_score = MAX(max_score, excluded.max_score),
+                last_completed_at = excluded.last_completed_at
+        """, (quiz_id, score, score))
+        
+        bucket = 0
+        if total_points > 0:
+            bucket = min(max(score, 0) * cls.HISTOGRAM_BUCKETS // total_points, cls.HISTOGRAM_BUCKETS - 1)
+        cursor.execute("""
+            INSERT INTO quiz_score_histogram (quiz_id, bucket, attempt_count)
+            VALUES (?, ?, 1)
+            ON CONFLICT (quiz_id, bucket) DO UPDATE SET attempt_count = attempt_count + 1
+        """, (quiz_id, bucket))
+        
+        cursor.execute("""
+            INSERT INTO quiz_leaderboard (quiz_id, user_id, best_score, total_points, achieved_at)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT (quiz_id, user_id) DO UPDATE SET
+                best_score = excluded.best_score,
+                total_points = excluded.total_points,
+                achieved_at = excluded.achieved_at
+            WHERE excluded.best_score > quiz_leaderboard.best_score
+        """, (quiz_id, user_id, score, total_points))
+        if cursor.rowcount:
             cursor.execute("""
-                INSERT INTO scores (user_id, quiz_id, score, total_points)
+                DELETE FROM quiz_leaderboard
+                WHERE quiz_id = ? AND user_id NOT IN (
+                    SELECT user_id
+                    FROM quiz_leaderboard
+                    WHERE quiz_id = ?
+                    ORDER BY best_score DESC, achieved_at, user_id
+                    LIMIT ?
+                )
+            """, (quiz_id, quiz_id, cls.LEADERBOARD_SIZE))
+    
+    def get_quiz_stats(self, quiz_id: int) -> Dict:
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT attempt_count, score_sum, max_score, last_completed_at
+            FROM quiz_stats
+            WHERE quiz_id = ?
+        """, (quiz_id,))
+        row = cursor.fetchone() or (0, 0, 0, None)
+        histogram = [0] * self.HISTOGRAM_BUCKETS
+        cursor.execute("""
+            SELECT bucket, attempt_count
+            FROM quiz_score_histogram
+            WHERE quiz_id = ?
+        """, (quiz_id,))
+        for bucket, count in cursor.fetchall():
+            histogram[bucket] = count
+        conn.close()
+        return {
+            "quiz_id": quiz_id,
+            "attempt_count": row[0],
+            "mean_score": row[1] / row[0] if row[0] else 0.0,
+            "max_score": row[2],
+            "last_completed_at": row[3],
+            "histogram": histogram
+        }
+    
+    def get_leaderboard(self, quiz_id: int, limit: Optional[int] = None) -> List[Dict]:
+        limit = min(limit or self.LEADERBOARD_SIZE, self.LEADERBOARD_SIZE)
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT lb.user_id, u.username, lb.best_score, lb.total_points, lb.achieved_at
+            FROM quiz_leaderboard lb
+            JOIN users u ON u.id = lb.user_id
+            WHERE lb.quiz_id = ?
+            ORDER BY lb.best_score DESC, lb.achieved_at, lb.user_id
+            LIMIT ?
+        """, (quiz_id, limit))
+        leaderboard = []
+        for rank, row in enumerate(cursor.fetchall(), start=1):
+            leaderboard.append({
+                "rank": rank,
+                "user_id": row[0],
+                "username": row[1],
+                "score": row[2],
+                "total_points": row[3],
+                "achieved_at": row[4]
+            })
+        conn.close()
+        return leaderboard
+    
+    def submit_attempt(self, user_id: int, quiz_id: int, responses: Dict[int, List[int]],
+                       attempt_id: Optional[int] = None) -> Dict:
+        rows = [
+            (user_id, question_id, option_id)
+            for question_id, selected_options in responses.items()
+            for option_id in dict.fromkeys(selected_options)
+        ]
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            answer_key = self.read_answer_key(cursor, quiz_id)
+            if answer_key is None:
+                raise ValueError("Quiz not found")
+            score, total_points = answer_key.grade(responses)
+            if attempt_id is None:
+                cursor.execute("""
+                    INSERT INTO attempts (user_id, quiz_id)
+                    VALUES (?, ?)
+                """, (user_id, quiz_id))
+                attempt_id = cursor.lastrowid
+            else:
+                cursor.execute("""
+                    SELECT 1 FROM attempts
+                    WHERE id = ? AND user_id = ? AND quiz_id = ? AND completed_at IS NULL
+                """, (attempt_id, user_id, quiz_id))
+                if not cursor.fetchone():
+                    raise ValueError("Attempt is not open")
+                cursor.execute("DELETE FROM responses WHERE attempt_id = ?", (attempt_id,))
+            cursor.executemany("""
+                INSERT INTO responses (user_id, question_id, selected_option_id, attempt_id)
                 VALUES (?, ?, ?, ?)
-            """, (user_id, quiz_id, score, total_points))
+            """, [row + (attempt_id,) for row in rows])
+            self.record_score(cursor, user_id, quiz_id, score, total_points, attempt_id)
             conn.commit()
             conn.close()
+            return {"attempt_id": attempt_id, "score": score, "total_points": total_points}
         except Exception as e:
             conn.rollback()
             conn.close()
@@ -412,8 +1584,17 @@ class Database:
         cursor = conn.cursor()
         try:
             cursor.execute("DELETE FROM quizzes WHERE id = ?", (quiz_id,))
+            cursor.execute("""
+                DELETE FROM option_aggregates
+                WHERE question_id IN (SELECT question_id FROM question_aggregates WHERE quiz_id = ?)
+            """, (quiz_id,))
+            for table in ("quiz_stats", "quiz_score_histogram", "quiz_leaderboard",
+                          "quiz_daily_aggregates", "question_aggregates"):
+                cursor.execute(f"DELETE FROM {table} WHERE quiz_id = ?", (quiz_id,))
+            self.refresh_search_index(cursor, [quiz_id])
             conn.commit()
             conn.close()
+            self.invalidate_quiz(quiz_id, lists=True)
         except Exception as e:
             conn.rollback()
             conn.close()
@@ -423,288 +1604,351 @@ class Database:
         conn = self.get_connection()
         cursor = conn.cursor()
         try:
+            quiz_id = self.get_question_quiz_id(cursor, question_id)
             cursor.execute("DELETE FROM questions WHERE id = ?", (question_id,))
+            for table in ("option_aggregates", "question_aggregates"):
+                cursor.execute(f"DELETE FROM {table} WHERE question_id = ?", (question_id,))
+            self.bump_quiz_version(cursor, quiz_id)
+            self.refresh_search_index(cursor, [quiz_id])
             conn.commit()
             conn.close()
+            self.invalidate_quiz(quiz_id)
+            if quiz_id is not None:
+                self.get_answer_key(quiz_id)
         except Exception as e:
             conn.rollback()
             conn.close()
             raise
     
-    def create_demo_quizzes(self, admin_id: int) -> None:
+    def create_demo_quizzes(self, admin_id: int) -> int:
+        demo_quizzes = [
+            {
+                "title": "Demo: Python Basics",
+                "description": "Test your knowledge of Python programming fundamentals",
+                "questions": [
+                    {
+                        "text": "What is the correct way to create a list in Python?",
+                        "type": "single_choice",
+                        "points": 1,
+                        "options": [
+                            {"text": "list = []", "correct": True},
+                            {"text": "list = {}", "correct": False},
+                            {"text": "list = ()", "correct": False},
+                            {"text": "list = None", "correct": False}
+                        ]
+                    },
+                    {
+                        "text": "Which of the following are Python data types?",
+                        "type": "multiple_choice",
+                        "points": 2,
+                        "options": [
+                            {"text": "int", "correct": True},
+                            {"text": "str", "correct": True},
+                            {"text": "float", "correct": True},
+                            {"text": "char", "correct": False}
+                        ]
+                    },
+                    {
+                        "text": "What does the 'len()' function do?",
+                        "type": "single_choice",
+                        "points": 1,
+                        "options": [
+                            {"text": "Returns the length of an object", "correct": True},
+                            {"text": "Returns the maximum value", "correct": False},
+                            {"text": "Returns the minimum value", "correct": False},
+                            {"text": "Converts to lowercase", "correct": False}
+                        ]
+                    },
+                    {
+                        "text": "How do you define a function in Python?",
+                        "type": "single_choice",
+                        "points": 1,
+                        "options": [
+                            {"text": "def function_name():", "correct": True},
+                            {"text": "function function_name():", "correct": False},
+                            {"text": "define function_name():", "correct": False},
+                            {"text": "func function_name():", "correct": False}
+                        ]
+                    },
+                    {
+                        "text": "Which methods can be used to add elements to a list?",
+                        "type": "multiple_choice",
+                        "points": 2,
+                        "options": [
+                            {"text": "append()", "correct": True},
+                            {"text": "insert()", "correct": True},
+                            {"text": "extend()", "correct": True},
+                            {"text": "add()", "correct": False}
+                        ]
+                    }
+                ]
+            },
+            {
+                "title": "Demo: SQL Fundamentals",
+                "description": "Basic SQL knowledge quiz covering queries, transactions, and database concepts",
+                "questions": [
+                    {
+                        "text": "What does SQL stand for?",
+                        "type": "single_choice",
+                        "points": 1,
+                        "options": [
+                            {"text": "Structured Query Language", "correct": True},
+                            {"text": "Simple Query Language", "correct": False},
+                            {"text": "Standard Query Language", "correct": False},
+                            {"text": "System Query Language", "correct": False}
+                        ]
+                    },
+                    {
+                        "text": "Which SQL statements are used for data manipulation?",
+                        "type": "multiple_choice",
+                        "points": 2,
+                        "options": [
+                            {"text": "SELECT", "correct": True},
+                            {"text": "INSERT", "correct": True},
+                            {"text": "UPDATE", "correct": True},
+                            {"text": "CREATE", "correct": False}
+                        ]
+                    },
+                    {
+                        "text": "What is a transaction in SQL?",
+                        "type": "single_choice",
+                        "points": 2,
+                        "options": [
+                            {"text": "A sequence of operations executed as a single unit", "correct": True},
+                            {"text": "A database table", "correct": False},
+                            {"text": "A SQL function", "correct": False},
+                            {"text": "A data type", "correct": False}
+                        ]
+                    },
+                    {
+                        "text": "What is the purpose of the PRIMARY KEY constraint?",
+                        "type": "single_choice",
+                        "points": 1,
+                        "options": [
+                            {"text": "Uniquely identifies each row in a table", "correct": True},
+                            {"text": "Links two tables together", "correct": False},
+                            {"text": "Prevents NULL values", "correct": False},
+                            {"text": "Sorts data automatically", "correct": False}
+                        ]
+                    },
+                    {
+                        "text": "Which SQL commands are used for transaction control?",
+                        "type": "multiple_choice",
+                        "points": 2,
+                        "options": [
+                            {"text": "COMMIT", "correct": True},
+                            {"text": "ROLLBACK", "correct": True},
+                            {"text": "BEGIN TRANSACTION", "correct": True},
+                            {"text": "EXECUTE", "correct": False}
+                        ]
+                    }
+                ]
+            },
+            {
+                "title": "Demo: General Knowledge",
+                "description": "A fun general knowledge quiz covering various topics",
+                "questions": [
+                    {
+                        "text": "What is the capital of France?",
+                        "type": "single_choice",
+                        "points": 1,
+                        "options": [
+                            {"text": "Paris", "correct": True},
+                            {"text": "London", "correct": False},
+                            {"text": "Berlin", "correct": False},
+                            {"text": "Madrid", "correct": False}
+                        ]
+                    },
+                    {
+                        "text": "Which of these are programming languages?",
+                        "type": "multiple_choice",
+                        "points": 2,
+                        "options": [
+                            {"text": "Python", "correct": True},
+                            {"text": "Java", "correct": True},
+                            {"text": "HTML", "correct": False},
+                            {"text": "CSS", "correct": False}
+                        ]
+                    },
+                    {
+                        "text": "What is 2 + 2?",
+                        "type": "single_choice",
+                        "points": 1,
+                        "options": [
+                            {"text": "4", "correct": True},
+                            {"text": "3", "correct": False},
+                            {"text": "5", "correct": False},
+                            {"text": "6", "correct": False}
+                        ]
+                    },
+                    {
+                        "text": "Which planets are in our solar system?",
+                        "type": "multiple_choice",
+                        "points": 2,
+                        "options": [
+                            {"text": "Earth", "correct": True},
+                            {"text": "Mars", "correct": True},
+                            {"text": "Jupiter", "correct": True},
+                            {"text": "Pluto", "correct": False}
+                        ]
+                    }
+                ]
+            },
+            {
+                "title": "Demo: Web Development",
+                "description": "Quiz about web development technologies and concepts",
+                "questions": [
+                    {
+                        "text": "What does HTML stand for?",
+                        "type": "single_choice",
+                        "points": 1,
+                        "options": [
+                            {"text": "HyperText Markup Language", "correct": True},
+                            {"text": "High Tech Modern Language", "correct": False},
+                            {"text": "Home Tool Markup Language", "correct": False},
+                            {"text": "Hyperlink Text Markup Language", "correct": False}
+                        ]
+                    },
+                    {
+                        "text": "Which of these are HTTP methods?",
+                        "type": "multiple_choice",
+                        "points": 2,
+                        "options": [
+                            {"text": "GET", "correct": True},
+                            {"text": "POST", "correct": True},
+                            {"text": "PUT", "correct": True},
+                            {"text": "FETCH", "correct": False}
+                        ]
+                    },
+                    {
+                        "text": "What is CSS used for?",
+                        "type": "single_choice",
+                        "points": 1,
+                        "options": [
+                            {"text": "Styling web pages", "correct": True},
+                            {"text": "Creating databases", "correct": False},
+                            {"text": "Writing server code", "correct": False},
+                            {"text": "Managing files", "correct": False}
+                        ]
+                    },
+                    {
+                        "text": "Which technologies are used for frontend development?",
+                        "type": "multiple_choice",
+                        "points": 2,
+                        "options": [
+                            {"text": "JavaScript", "correct": True},
+                            {"text": "React", "correct": True},
+                            {"text": "CSS", "correct": True},
+                            {"text": "MySQL", "correct": False}
+                        ]
+                    }
+                ]
+            }
+        ]
+        
+        return self.import_quizzes(demo_quizzes, admin_id)["created"]
+    
+    def import_quizzes(self, quizzes: Iterable[Dict], created_by: int, batch_size: int = 500,
+                       on_progress: Optional[Callable[[Dict], None]] = None) -> Dict:
+        stats = {"created": 0, "skipped": 0, "questions": 0, "options": 0,
+                 "elapsed": 0.0, "quizzes_per_second": 0.0}
+        started = time.perf_counter()
+        
+        def flush(batch: List[Dict]) -> None:
+            self.import_quiz_batch(batch, created_by, stats)
+            stats["elapsed"] = time.perf_counter() - started
+            if stats["elapsed"] > 0:
+                stats["quizzes_per_second"] = (stats["created"] + stats["skipped"]) / stats["elapsed"]
+            if on_progress:
+                on_progress(dict(stats))
+        
+        try:
+            batch = []
+            for quiz in quizzes:
+                batch.append(quiz)
+                if len(batch) >= batch_size:
+                    flush(batch)
+                    batch = []
+            if batch:
+                flush(batch)
+        finally:
+            if stats["created"]:
+                self.invalidate_quiz(None, lists=True)
+        return stats
+    
+    def import_quiz_batch(self, batch: List[Dict], created_by: int, stats: Dict) -> None:
         conn = self.get_connection()
         cursor = conn.cursor()
         try:
-            demo_quizzes = [
-                {
-                    "title": "Demo: Python Basics",
-                    "description": "Test your knowledge of Python programming fundamentals",
-                    "questions": [
-                        {
-                            "text": "What is the correct way to create a list in Python?",
-                            "type": "single_choice",
-                            "points": 1,
-                            "options": [
-                                {"text": "list = []", "correct": True},
-                                {"text": "list = {}", "correct": False},
-                                {"text": "list = ()", "correct": False},
-                                {"text": "list = None", "correct": False}
-                            ]
-                        },
-                        {
-                            "text": "Which of the following are Python data types?",
-                            "type": "multiple_choice",
-                            "points": 2,
-                            "options": [
-                                {"text": "int", "correct": True},
-                                {"text": "str", "correct": True},
-                                {"text": "float", "correct": True},
-                                {"text": "char", "correct": False}
-                            ]
-                        },
-                        {
-                            "text": "What does the 'len()' function do?",
-                            "type": "single_choice",
-                            "points": 1,
-                            "options": [
-                                {"text": "Returns the length of an object", "correct": True},
-                                {"text": "Returns the maximum value", "correct": False},
-                                {"text": "Returns the minimum value", "correct": False},
-                                {"text": "Converts to lowercase", "correct": False}
-                            ]
-                        },
-                        {
-                            "text": "How do you define a function in Python?",
-                            "type": "single_choice",
-                            "points": 1,
-                            "options": [
-                                {"text": "def function_name():", "correct": True},
-                                {"text": "function function_name():", "correct": False},
-                                {"text": "define function_name():", "correct": False},
-                                {"text": "func function_name():", "correct": False}
-                            ]
-                        },
-                        {
-                            "text": "Which methods can be used to add elements to a list?",
-                            "type": "multiple_choice",
-                            "points": 2,
-                            "options": [
-                                {"text": "append()", "correct": True},
-                                {"text": "insert()", "correct": True},
-                                {"text": "extend()", "correct": True},
-                                {"text": "add()", "correct": False}
-                            ]
-                        }
-                    ]
-                },
-                {
-                    "title": "Demo: SQL Fundamentals",
-                    "description": "Basic SQL knowledge quiz covering queries, transactions, and database concepts",
-                    "questions": [
-                        {
-                            "text": "What does SQL stand for?",
-                            "type": "single_choice",
-                            "points": 1,
-                            "options": [
-                                {"text": "Structured Query Language", "correct": True},
-                                {"text": "Simple Query Language", "correct": False},
-                                {"text": "Standard Query Language", "correct": False},
-                                {"text": "System Query Language", "correct": False}
-                            ]
-                        },
-                        {
-                            "text": "Which SQL statements are used for data manipulation?",
-                            "type": "multiple_choice",
-                            "points": 2,
-                            "options": [
-                                {"text": "SELECT", "correct": True},
-                                {"text": "INSERT", "correct": True},
-                                {"text": "UPDATE", "correct": True},
-                                {"text": "CREATE", "correct": False}
-                            ]
-                        },
-                        {
-                            "text": "What is a transaction in SQL?",
-                            "type": "single_choice",
-                            "points": 2,
-                            "options": [
-                                {"text": "A sequence of operations executed as a single unit", "correct": True},
-                                {"text": "A database table", "correct": False},
-                                {"text": "A SQL function", "correct": False},
-                                {"text": "A data type", "correct": False}
-                            ]
-                        },
-                        {
-                            "text": "What is the purpose of the PRIMARY KEY constraint?",
-                            "type": "single_choice",
-                            "points": 1,
-                            "options": [
-                                {"text": "Uniquely identifies each row in a table", "correct": True},
-                                {"text": "Links two tables together", "correct": False},
-                                {"text": "Prevents NULL values", "correct": False},
-                                {"text": "Sorts data automatically", "correct": False}
-                            ]
-                        },
-                        {
-                            "text": "Which SQL commands are used for transaction control?",
-                            "type": "multiple_choice",
-                            "points": 2,
-                            "options": [
-                                {"text": "COMMIT", "correct": True},
-                                {"text": "ROLLBACK", "correct": True},
-                                {"text": "BEGIN TRANSACTION", "correct": True},
-                                {"text": "EXECUTE", "correct": False}
-                            ]
-                        }
-                    ]
-                },
-                {
-                    "title": "Demo: General Knowledge",
-                    "description": "A fun general knowledge quiz covering various topics",
-                    "questions": [
-                        {
-                            "text": "What is the capital of France?",
-                            "type": "single_choice",
-                            "points": 1,
-                            "options": [
-                                {"text": "Paris", "correct": True},
-                                {"text": "London", "correct": False},
-                                {"text": "Berlin", "correct": False},
-                                {"text": "Madrid", "correct": False}
-                            ]
-                        },
-                        {
-                            "text": "Which of these are programming languages?",
-                            "type": "multiple_choice",
-                            "points": 2,
-                            "options": [
-                                {"text": "Python", "correct": True},
-                                {"text": "Java", "correct": True},
-                                {"text": "HTML", "correct": False},
-                                {"text": "CSS", "correct": False}
-                            ]
-                        },
-                        {
-                            "text": "What is 2 + 2?",
-                            "type": "single_choice",
-                            "points": 1,
-                            "options": [
-                                {"text": "4", "correct": True},
-                                {"text": "3", "correct": False},
-                                {"text": "5", "correct": False},
-                                {"text": "6", "correct": False}
-                            ]
-                        },
-                        {
-                            "text": "Which planets are in our solar system?",
-                            "type": "multiple_choice",
-                            "points": 2,
-                            "options": [
-                                {"text": "Earth", "correct": True},
-                                {"text": "Mars", "correct": True},
-                                {"text": "Jupiter", "correct": True},
-                                {"text": "Pluto", "correct": False}
-                            ]
-                        }
-                    ]
-                },
-                {
-                    "title": "Demo: Web Development",
-                    "description": "Quiz about web development technologies and concepts",
-                    "questions": [
-                        {
-                            "text": "What does HTML stand for?",
-                            "type": "single_choice",
-                            "points": 1,
-                            "options": [
-                                {"text": "HyperText Markup Language", "correct": True},
-                                {"text": "High Tech Modern Language", "correct": False},
-                                {"text": "Home Tool Markup Language", "correct": False},
-                                {"text": "Hyperlink Text Markup Language", "correct": False}
-                            ]
-                        },
-                        {
-                            "text": "Which of these are HTTP methods?",
-                            "type": "multiple_choice",
-                            "points": 2,
-                            "options": [
-                                {"text": "GET", "correct": True},
-                                {"text": "POST", "correct": True},
-                                {"text": "PUT", "correct": True},
-                                {"text": "FETCH", "correct": False}
-                            ]
-                        },
-                        {
-                            "text": "What is CSS used for?",
-                            "type": "single_choice",
-                            "points": 1,
-                            "options": [
-                                {"text": "Styling web pages", "correct": True},
-                                {"text": "Creating databases", "correct": False},
-                                {"text": "Writing server code", "correct": False},
-                                {"text": "Managing files", "correct": False}
-                            ]
-                        },
-                        {
-                            "text": "Which technologies are used for frontend development?",
-                            "type": "multiple_choice",
-                            "points": 2,
-                            "options": [
-                                {"text": "JavaScript", "correct": True},
-                                {"text": "React", "correct": True},
-                                {"text": "CSS", "correct": True},
-                                {"text": "MySQL", "correct": False}
-                            ]
-                        }
-                    ]
-                }
-            ]
+            cursor.execute("BEGIN IMMEDIATE")
+            existing = set()
+            titles = list({quiz["title"] for quiz in batch})
+            for start in range(0, len(titles), self.MAX_QUERY_PARAMS):
+                chunk = titles[start:start + self.MAX_QUERY_PARAMS]
+                placeholders = ", ".join("?" * len(chunk))
+                cursor.execute(f"SELECT title FROM quizzes WHERE title IN ({placeholders})", chunk)
+                existing.update(row[0] for row in cursor.fetchall())
             
-            created_count = 0
-            for quiz_data in demo_quizzes:
-                cursor.execute("SELECT id FROM quizzes WHERE title = ?", (quiz_data["title"],))
-                existing = cursor.fetchone()
-                
-                if existing:
+            quiz_id = self.get_next_id(cursor, "quizzes")
+            question_id = self.get_next_id(cursor, "questions")
+            quiz_rows, question_rows, option_rows = [], [], []
+            skipped = 0
+            for quiz_data in batch:
+                if quiz_data["title"] in existing:
+                    skipped += 1
                     continue
+                existing.add(quiz_data["title"])
                 
-                cursor.execute("""
-                    INSERT INTO quizzes (title, description, created_by)
-                    VALUES (?, ?, ?)
-                """, (quiz_data["title"], quiz_data["description"], admin_id))
-                quiz_id = cursor.lastrowid
-                created_count += 1
-                
-                for q_data in quiz_data["questions"]:
-                    cursor.execute("""
-                        INSERT INTO questions (quiz_id, question_text, question_type, points)
-                        VALUES (?, ?, ?, ?)
-                    """, (quiz_id, q_data["text"], q_data["type"], q_data["points"]))
-                    question_id = cursor.lastrowid
-                    
-                    for opt_data in q_data["options"]:
-                        cursor.execute("""
-                            INSERT INTO options (question_id, option_text, is_correct)
-                            VALUES (?, ?, ?)
-                        """, (question_id, opt_data["text"], 1 if opt_data["correct"] else 0))
+                quiz_rows.append((quiz_id, quiz_data["title"], quiz_data.get("description", ""), created_by))
+                for q_data in quiz_data.get("questions", []):
+                    question_rows.append((question_id, quiz_id, q_data["text"], q_data["type"],
+                                          q_data.get("points", 1)))
+                    for opt_data in q_data.get("options", []):
+                        option_rows.append((question_id, opt_data["text"], 1 if opt_data["correct"] else 0))
+                    question_id += 1
+                quiz_id += 1
             
+            cursor.executemany("""
+                INSERT INTO quizzes (id, title, description, created_by)
+                VALUES (?, ?, ?, ?)
+            """, quiz_rows)
+            cursor.executemany("""
+                INSERT INTO questions (id, quiz_id, question_text, question_type, points)
+                VALUES (?, ?, ?, ?, ?)
+            """, question_rows)
+            cursor.executemany("""
+                INSERT INTO options (question_id, option_text, is_correct)
+                VALUES (?, ?, ?)
+            """, option_rows)
+            self.refresh_search_index(cursor, [row[0] for row in quiz_rows])
             conn.commit()
             conn.close()
-            return created_count
+            stats["created"] += len(quiz_rows)
+            stats["skipped"] += skipped
+            stats["questions"] += len(question_rows)
+            stats["options"] += len(option_rows)
         except Exception as e:
             conn.rollback()
             conn.close()
             raise
     
+    @staticmethod
+    def get_next_id(cursor: sqlite3.Cursor, table: str) -> int:
+        cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,))
+        row = cursor.fetchone()
+        sequence = row[0] if row else 0
+        cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}")
+        return max(sequence, cursor.fetchone()[0]) + 1
+    
     def get_user_scores(self, user_id: int) -> List[Dict]:
         conn = self.get_connection()
         cursor = conn.cursor()
         cursor.execute("""
-            SELECT s.id, q.title, s.score, s.total_points, s.completed_at
+            SELECT s.id, q.title, s.score, s.total_points, s.completed_at, s.attempt_id
             FROM scores s
             JOIN quizzes q ON s.quiz_id = q.id
             WHERE s.user_id = ?
-            ORDER BY s.completed_at DESC
+            ORDER BY s.completed_at DESC, s.id DESC
         """, (user_id,))
         scores = []
         for row in cursor.fetchall():
@@ -713,8 +1957,44 @@ class Database:
                 "quiz_title": row[1],
                 "score": row[2],
                 "total_points": row[3],
-                "completed_at": row[4]
+                "completed_at": row[4],
+                "attempt_id": row[5]
+            })
+        conn.close()
+        return scores
+    
+    
+    def get_user_scores_page(self, user_id: int, before: Optional[Tuple[str, int]] = None,
+                             limit: int = 50) -> List[Dict]:
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        if before is None:
+            cursor.execute("""
+                SELECT s.id, q.title, s.score, s.total_points, s.completed_at, s.attempt_id
+                FROM scores s
+                JOIN quizzes q ON s.quiz_id = q.id
+                WHERE s.user_id = ?
+                ORDER BY s.completed_at DESC, s.id DESC
+                LIMIT ?
+            """, (user_id, limit))
+        else:
+            cursor.execute("""
+                SELECT s.id, q.title, s.score, s.total_points, s.completed_at, s.attempt_id
+                FROM scores s
+                JOIN quizzes q ON s.quiz_id = q.id
+                WHERE s.user_id = ? AND (s.completed_at, s.id) < (?, ?)
+                ORDER BY s.completed_at DESC, s.id DESC
+                LIMIT ?
+            """, (user_id, before[0], before[1], limit))
+        scores = []
+        for row in cursor.fetchall():
+            scores.append({
+                "id": row[0],
+                "quiz_title": row[1],
+                "score": row[2],
+                "total_points": row[3],
+                "completed_at": row[4],
+                "attempt_id": row[5]
             })
         conn.close()
         return scores
-
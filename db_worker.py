@@ -0,0 +1,70 @@
+import queue
+import tkinter as tk
+from tkinter import ttk, messagebox
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+class DatabaseWorker:
+    def __init__(self, window: tk.Misc, max_workers: int = 2, poll_interval: int = 30,
+                 progress: Optional[ttk.Progressbar] = None):
+        self.window = window
+        self.poll_interval = poll_interval
+        self.progress = progress
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-worker")
+        self.results = queue.Queue()
+        self.pending = 0
+        self.polling = False
+        self.closed = False
+    
+    def submit(self, fn: Callable, *args, on_success: Optional[Callable] = None,
+               on_error: Optional[Callable[[Exception], None]] = None,
+               error_title: str = "Error") -> Future:
+        future = self.executor.submit(fn, *args)
+        self.pending += 1
+        if self.pending == 1 and self.progress is not None:
+            self.progress.start(10)
+        future.add_done_callback(lambda done: self.results.put((done, on_success, on_error, error_title)))
+        if not self.polling:
+            self.polling = True
+            self.window.after(self.poll_interval, self.poll)
+        return future
+    
+    def poll(self) -> None:
+        if self.closed:
+            return
+        
+        while True:
+            try:
+                future, on_success, on_error, error_title = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending -= 1
+            if self.pending == 0 and self.progress is not None:
+                self.progress.stop()
+            self.dispatch(future, on_success, on_error, error_title)
+            if self.closed:
+                return
+        
+        if self.pending:
+            self.window.after(self.poll_interval, self.poll)
+        else:
+            self.polling = False
+    
+    def dispatch(self, future: Future, on_success: Optional[Callable],
+                 on_error: Optional[Callable[[Exception], None]], error_title: str) -> None:
+        error = future.exception()
+        if error is not None:
+            if on_error:
+                on_error(error)
+            else:
+                messagebox.showerror(error_title, str(error), parent=self.window)
+        elif on_success:
+            on_success(future.result())
+    
+    @property
+    def busy(self) -> bool:
+        return self.pending > 0
+    
+    def shutdown(self) -> None:
+        self.closed = True
+        self.executor.shutdown(wait=False, cancel_futures=True)
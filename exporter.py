@@ -0,0 +1,164 @@
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+from typing import Dict, Iterable, Iterator, List, Tuple
+from database import Database
+
+MAGIC = b"QZC1"
+SNAPSHOT_TABLES = ("quiz_content", "attempts", "responses", "scores")
+
+class ColumnarWriter:
+    def __init__(self, path: str, columns: List[Tuple[str, str]], row_group_size: int = 65536):
+        self.path = path
+        self.columns = columns
+        self.row_group_size = row_group_size
+        self.row_count = 0
+        self._buffer = [[] for _ in columns]
+        self._file = open(path + ".tmp", "wb")
+        header = json.dumps({"columns": columns}).encode("utf-8")
+        self._file.write(MAGIC + struct.pack("<I", len(header)) + header)
+    
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+            os.remove(self._file.name)
+    
+    def write_rows(self, rows: Iterable[Tuple]) -> None:
+        for row in rows:
+            for values, value in zip(self._buffer, row):
+                values.append(value)
+            if len(self._buffer[0]) >= self.row_group_size:
+                self.flush()
+    
+    def flush(self) -> None:
+        count = len(self._buffer[0])
+        if not count:
+            return
+        
+        self._file.write(struct.pack("<I", count))
+        for (_, column_type), values in zip(self.columns, self._buffer):
+            chunk = zlib.compress(self.encode_column(column_type, values))
+            self._file.write(struct.pack("<I", len(chunk)) + chunk)
+        self.row_count += count
+        self._buffer = [[] for _ in self.columns]
+    
+    @staticmethod
+    def encode_column(column_type: str, values: List) -> bytes:
+        if column_type == "int":
+            validity = bytes(value is not None for value in values)
+            data = array("q", (0 if value is None else int(value) for value in values))
+            return validity + data.tobytes()
+        
+        encoded = [None if value is None else str(value).encode("utf-8") for value in values]
+        lengths = array("i", (-1 if value is None else len(value) for value in encoded))
+        return lengths.tobytes() + b"".join(value for value in encoded if value is not None)
+    
+    def close(self) -> None:
+        self.flush()
+        self._file.write(struct.pack("<I", 0))
+        self._file.close()
+        os.replace(self._file.name, self.path)
+
+def read_columnar(path: str) -> Iterator[Dict]:
+    with open(path, "rb") as f:
+        if f.read(4) != MAGIC:
+            raise ValueError(f"{path} is not a columnar snapshot")
+        header_length, = struct.unpack("<I", f.read(4))
+        columns = json.loads(f.read(header_length))["columns"]
+        names = [name for name, _ in columns]
+        
+        while True:
+            count, = struct.unpack("<I", f.read(4))
+            if not count:
+                return
+            decoded = []
+            for _, column_type in columns:
+                chunk_length, = struct.unpack("<I", f.read(4))
+                data = zlib.decompress(f.read(chunk_length))
+                decoded.append(decode_column(column_type, data, count))
+            for row in zip(*decoded):
+                yield dict(zip(names, row))
+
+def decode_column(column_type: str, data: bytes, count: int) -> List:
+    if column_type == "int":
+        values = array("q")
+        values.frombytes(data[count:])
+        return [value if valid else None for valid, value in zip(data[:count], values)]
+    
+    lengths = array("i")
+    lengths.frombytes(data[:count * lengths.itemsize])
+    values = []
+    offset = count * lengths.itemsize
+    for length in lengths:
+        if length < 0:
+            values.append(None)
+        else:
+            values.append(data[offset:offset + length].decode("utf-8"))
+            offset += length
+    return values
+
+def write_jsonl(path: str, records: Iterable[Dict]) -> int:
+    count = 0
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    os.replace(path + ".tmp", path)
+    return count
+
+def export_snapshot(db: Database, out_dir: str, formats: Iterable[str] = ("jsonl", "columnar"),
+                    batch_size: int = 1000, row_group_size: int = 65536) -> Dict[str, int]:
+    os.makedirs(out_dir, exist_ok=True)
+    counts = {}
+    formats = set(formats)
+    
+    if "jsonl" in formats:
+        counts["quizzes.jsonl"] = write_jsonl(os.path.join(out_dir, "quizzes.jsonl"),
+                                              db.iter_quizzes_with_questions(batch_size))
+        for table in SNAPSHOT_TABLES[1:]:
+            names = [name for name, _ in db.EXPORT_TABLES[table][0]]
+            rows = (dict(zip(names, row)) for row in db.iter_export_rows(table, batch_size))
+            counts[f"{table}.jsonl"] = write_jsonl(os.path.join(out_dir, f"{table}.jsonl"), rows)
+    
+    if "columnar" in formats:
+        for table in SNAPSHOT_TABLES:
+            path = os.path.join(out_dir, f"{table}.qzc")
+            with ColumnarWriter(path, db.EXPORT_TABLES[table][0], row_group_size) as writer:
+                writer.write_rows(db.iter_export_rows(table, batch_size))
+            counts[f"{table}.qzc"] = writer.row_count
+    
+    return counts
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export quiz content and results as JSON Lines and columnar snapshots")
+    parser.add_argument("out_dir", help="directory the snapshot files are written to")
+    parser.add_argument("--db", default="quiz.db", help="database file")
+    parser.add_argument("--format", action="append", choices=["jsonl", "columnar"],
+                        help="output format (repeatable, default: both)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="rows fetched per cursor round-trip")
+    parser.add_argument("--row-group-size", type=int, default=65536, help="rows per columnar row group")
+    args = parser.parse_args()
+    
+    started = time.perf_counter()
+    with Database(args.db) as db:
+        counts = export_snapshot(db, args.out_dir, args.format or ("jsonl", "columnar"),
+                                 args.batch_size, args.row_group_size)
+    elapsed = time.perf_counter() - started
+    
+    for name, count in counts.items():
+        print(f"{name}: {count} rows")
+    print(f"Exported in {elapsed:.2f}s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
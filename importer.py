@@ -0,0 +1,81 @@
+import argparse
+import csv
+import json
+import sys
+from typing import Dict, Iterator
+from database import Database
+
+TRUE_VALUES = {"1", "true", "yes", "y", "x"}
+
+def read_jsonl(path: str) -> Iterator[Dict]:
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_number}: invalid JSON ({e.msg})")
+
+def read_csv(path: str) -> Iterator[Dict]:
+    with open(path, encoding="utf-8", newline="") as f:
+        quiz = None
+        question = None
+        for row in csv.DictReader(f):
+            if quiz is None or quiz["title"] != row["title"]:
+                if quiz is not None:
+                    yield quiz
+                quiz = {"title": row["title"], "description": row.get("description", ""), "questions": []}
+                question = None
+            
+            if not row.get("question"):
+                continue
+            if question is None or question["text"] != row["question"]:
+                question = {
+                    "text": row["question"],
+                    "type": row.get("type") or "single_choice",
+                    "points": int(row.get("points") or 1),
+                    "options": []
+                }
+                quiz["questions"].append(question)
+            
+            if row.get("option"):
+                question["options"].append({
+                    "text": row["option"],
+                    "correct": (row.get("correct") or "").strip().lower() in TRUE_VALUES
+                })
+        
+        if quiz is not None:
+            yield quiz
+
+def read_quizzes(path: str) -> Iterator[Dict]:
+    if path.lower().endswith(".csv"):
+        return read_csv(path)
+    return read_jsonl(path)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk import quizzes from JSON Lines or CSV")
+    parser.add_argument("path", help="input file (.jsonl or .csv)")
+    parser.add_argument("--db", default="quiz.db", help="database file")
+    parser.add_argument("--owner", default="admin", help="username recorded as the quiz creator")
+    parser.add_argument("--batch-size", type=int, default=500, help="quizzes per transaction")
+    args = parser.parse_args()
+    
+    def report(stats: Dict) -> None:
+        print(f"\r{stats['created']} created, {stats['skipped']} skipped "
+              f"({stats['quizzes_per_second']:.0f} quizzes/s)", end="", file=sys.stderr)
+    
+    with Database(args.db) as db:
+        owner = db.get_user_by_username(args.owner)
+        if not owner:
+            parser.error(f"Unknown user: {args.owner}")
+        stats = db.import_quizzes(read_quizzes(args.path), owner["id"], args.batch_size, report)
+    
+    print(file=sys.stderr)
+    print(f"Imported {stats['created']} quizzes ({stats['questions']} questions, {stats['options']} options), "
+          f"skipped {stats['skipped']} existing, in {stats['elapsed']:.2f}s "
+          f"({stats['quizzes_per_second']:.0f} quizzes/s)")
+
+if __name__ == "__main__":
+    main()
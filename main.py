@@ -4,18 +4,26 @@ from admin_window import AdminWindow
 from user_window import UserWindow
 
 def main():
-    db = Database("quiz.db")
-    
+    with Database("quiz.db") as db:
+        run_app(db)
+
+def run_app(db: Database):
     def show_login():
         auth_window = AuthWindow(db, on_auth_success)
         auth_window.run()
     
-    def on_auth_success(user):
+    def on_auth_success(session):
+        user = session["user"]
+        
+        def on_logout():
+            db.logout(session["token"])
+            show_login()
+        
         if user["role"] == "admin":
-            admin_window = AdminWindow(db, user, on_logout=show_login)
+            admin_window = AdminWindow(db, user, on_logout=on_logout)
             admin_window.run()
         else:
-            user_window = UserWindow(db, user, on_logout=show_login)
+            user_window = UserWindow(db, user, on_logout=on_logout)
             user_window.run()
     
     show_login()
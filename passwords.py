@@ -0,0 +1,93 @@
+import hashlib
+import hmac
+import multiprocessing
+import os
+import re
+import secrets
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+ALGORITHM = "pbkdf2_sha256"
+DEFAULT_ITERATIONS = 600000
+SALT_BYTES = 16
+LEGACY_HASH = re.compile(r"^[0-9a-f]{64}$")
+
+def hash_password(password: str, iterations: int = DEFAULT_ITERATIONS, salt: Optional[bytes] = None) -> str:
+    salt = salt or os.urandom(SALT_BYTES)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+    return f"{ALGORITHM}${iterations}${salt.hex()}${digest.hex()}"
+
+def is_legacy_hash(stored: str) -> bool:
+    return bool(LEGACY_HASH.match(stored))
+
+def verify_password(password: str, stored: str) -> bool:
+    if is_legacy_hash(stored):
+        return hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), stored)
+    try:
+        algorithm, iterations, salt, digest = stored.split("$")
+        if algorithm != ALGORITHM:
+            return False
+        expected = hashlib.pbkdf2_hmac("sha256", password.encode(), bytes.fromhex(salt), int(iterations))
+    except ValueError:
+        return False
+    return hmac.compare_digest(expected.hex(), digest)
+
+def needs_rehash(stored: str, iterations: int = DEFAULT_ITERATIONS) -> bool:
+    if is_legacy_hash(stored):
+        return True
+    parts = stored.split("$")
+    return len(parts) != 4 or parts[0] != ALGORITHM or not parts[1].isdigit() or int(parts[1]) < iterations
+
+class PasswordHasher:
+    def __init__(self, iterations: int = DEFAULT_ITERATIONS, max_workers: int = 2, cache_size: int = 1024):
+        self.iterations = iterations
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+        self.cache_key = secrets.token_bytes(32)
+        self.dummy_hash = f"{ALGORITHM}${iterations}${'00' * SALT_BYTES}${'00' * 32}"
+        self.verified = OrderedDict()
+        self.executor = None
+        self.lock = threading.Lock()
+    
+    def run(self, fn: Callable, *args):
+        if self.max_workers <= 0:
+            return fn(*args)
+        with self.lock:
+            if self.executor is None:
+                start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                self.executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                    mp_context=multiprocessing.get_context(start_method))
+            executor = self.executor
+        return executor.submit(fn, *args).result()
+    
+    def hash(self, password: str) -> str:
+        return self.run(hash_password, password, self.iterations)
+    
+    def verify(self, password: str, stored: str) -> bool:
+        key = hmac.new(self.cache_key, f"{stored}\0{password}".encode(), hashlib.sha256).digest()
+        with self.lock:
+            if key in self.verified:
+                self.verified.move_to_end(key)
+                return True
+        
+        if is_legacy_hash(stored):
+            verified = verify_password(password, stored)
+        else:
+            verified = self.run(verify_password, password, stored)
+        if verified and self.cache_size > 0:
+            with self.lock:
+                self.verified[key] = None
+                while len(self.verified) > self.cache_size:
+                    self.verified.popitem(last=False)
+        return verified
+    
+    def needs_rehash(self, stored: str) -> bool:
+        return needs_rehash(stored, self.iterations)
+    
+    def close(self) -> None:
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(wait=True, cancel_futures=True)
+                self.executor = None
@@ -0,0 +1,51 @@
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+class AnswerKey:
+    def __init__(self, quiz_id: int, entries: Dict[int, Tuple[bool, FrozenSet[int], int]]):
+        self.quiz_id = quiz_id
+        self.entries = entries
+        self.total_points = sum(points for _, _, points in entries.values())
+    
+    @classmethod
+    def from_quiz(cls, quiz: Dict) -> "AnswerKey":
+        entries = {}
+        for question in quiz["questions"]:
+            correct = [opt["id"] for opt in question["options"] if opt["is_correct"]]
+            is_multiple = question["question_type"] == "multiple_choice"
+            if not is_multiple:
+                correct = correct[:1]
+            entries[question["id"]] = (is_multiple, frozenset(correct), question["points"])
+        return cls(quiz["id"], entries)
+    
+    @classmethod
+    def from_rows(cls, quiz_id: int, rows: Iterable[Tuple]) -> "AnswerKey":
+        entries = {}
+        for question_id, question_type, points, option_id in rows:
+            if question_id is None:
+                continue
+            is_multiple = question_type == "multiple_choice"
+            if question_id not in entries:
+                entries[question_id] = (is_multiple, [], points)
+            correct = entries[question_id][1]
+            if option_id is not None and (is_multiple or not correct):
+                correct.append(option_id)
+        return cls(quiz_id, {
+            question_id: (is_multiple, frozenset(correct), points)
+            for question_id, (is_multiple, correct, points) in entries.items()
+        })
+    
+    def is_correct(self, question_id: int, selected: List[int]) -> bool:
+        entry = self.entries.get(question_id)
+        if entry is None or not selected:
+            return False
+        
+        _, correct, _ = entry
+        return bool(correct) and correct == frozenset(selected)
+    
+    def grade(self, responses: Dict[int, List[int]]) -> Tuple[int, int]:
+        earned_points = sum(
+            self.entries[question_id][2]
+            for question_id, selected in responses.items()
+            if self.is_correct(question_id, selected)
+        )
+        return earned_points, self.total_points
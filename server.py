@@ -0,0 +1,330 @@
+import argparse
+import http.client
+import json
+import math
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import SplitResult, parse_qs, urlsplit
+from database import Database
+from sessions import RateLimitError
+
+QUIZ_PATH = re.compile(r"^/quizzes/(\d+)$")
+SUBMIT_PATH = re.compile(r"^/quizzes/(\d+)/submit$")
+LEADERBOARD_PATH = re.compile(r"^/quizzes/(\d+)/leaderboard$")
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+class QuizServer(ThreadingHTTPServer):
+    daemon_threads = True
+    
+    def __init__(self, address: Tuple[str, int], db: Database, workers: int = 16, quiet: bool = False,
+                 max_connections: int = 256):
+        super().__init__(address, QuizRequestHandler)
+        self.db = db
+        self.quiet = quiet
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http-worker")
+        self.connection_slots = threading.BoundedSemaphore(max_connections)
+    
+    def process_request(self, request, client_address) -> None:
+        if not self.connection_slots.acquire(blocking=False):
+            try:
+                request.sendall(b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+        super().process_request(request, client_address)
+    
+    def process_request_thread(self, request, client_address) -> None:
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self.connection_slots.release()
+    
+    def server_close(self) -> None:
+        super().server_close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+class QuizRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    timeout = 5
+    max_body_size = 1 << 20
+    
+    def do_GET(self) -> None:
+        self.dispatch("GET")
+    
+    def do_POST(self) -> None:
+        self.dispatch("POST")
+    
+    def dispatch(self, method: str) -> None:
+        url = urlsplit(self.path)
+        try:
+            body = self.read_body()
+            result = self.server.executor.submit(self.route, method, url, body).result()
+            self.send_json(200, result)
+        except HTTPError as e:
+            self.send_json(e.status, {"error": str(e)})
+        except RateLimitError as e:
+            self.send_json(429, {"error": str(e)}, {"Retry-After": str(math.ceil(e.retry_after))})
+        except ValueError as e:
+            self.send_json(400, {"error": str(e)})
+        except Exception as e:
+            self.log_error("Request failed: %r", e)
+            self.send_json(500, {"error": "Internal server error"})
+    
+    def route(self, method: str, url: SplitResult, body: Dict) -> Dict:
+        if method == "GET" and url.path == "/health":
+            return {"status": "ok"}
+        elif method == "POST" and url.path == "/login":
+            return self.login(body)
+        elif method == "POST" and url.path == "/logout":
+            return self.logout()
+        elif method == "GET" and url.path == "/quizzes":
+            return self.list_quizzes(parse_qs(url.query))
+        elif method == "GET" and QUIZ_PATH.match(url.path):
+            return self.get_quiz(int(QUIZ_PATH.match(url.path).group(1)))
+        elif method == "GET" and LEADERBOARD_PATH.match(url.path):
+            return self.get_leaderboard(int(LEADERBOARD_PATH.match(url.path).group(1)))
+        elif method == "POST" and SUBMIT_PATH.match(url.path):
+            return self.submit(int(SUBMIT_PATH.match(url.path).group(1)), body)
+        else:
+            raise HTTPError(404, "Not found")
+    
+    def read_body(self) -> Dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > self.max_body_size:
+            self.close_connection = True
+            raise HTTPError(413, "Request body too large")
+        if not length:
+            return {}
+        try:
+            body = json.loads(self.rfile.read(length))
+        except json.JSONDecodeError:
+            raise HTTPError(400, "Invalid JSON body")
+        if not isinstance(body, dict):
+            raise HTTPError(400, "JSON body must be an object")
+        return body
+    
+    def send_json(self, status: int, payload: Dict, headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def get_token(self) -> Optional[str]:
+        header = self.headers.get("Authorization", "")
+        return header[7:] if header.startswith("Bearer ") else None
+    
+    def require_user(self) -> Dict:
+        token = self.get_token()
+        user = self.server.db.get_session_user(token) if token else None
+        if not user:
+            raise HTTPError(401, "Authentication required")
+        return user
+    
+    def login(self, body: Dict) -> Dict:
+        username = str(body.get("username", "")).strip()
+        password = str(body.get("password", ""))
+        if not username or not password:
+            raise HTTPError(400, "username and password are required")
+        session = self.server.db.login(username, password, self.client_address[0])
+        if not session:
+            raise HTTPError(401, "Invalid username or password")
+        return session
+    
+    def logout(self) -> Dict:
+        token = self.get_token()
+        if token:
+            self.server.db.logout(token)
+        return {"status": "ok"}
+    
+    def list_quizzes(self, query: Dict[str, List[str]]) -> Dict:
+        limit = min(max(int(query.get("limit", ["50"])[0]), 1), 200)
+        search = query.get("q", [""])[0].strip()
+        if search:
+            return {"quizzes": self.server.db.search_quizzes(search, limit), "next": None}
+        
+        after = None
+        if "after_title" in query and "after_id" in query:
+            after = (query["after_title"][0], int(query["after_id"][0]))
+        quizzes = self.server.db.get_quizzes_page(after, limit)
+        next_cursor = None
+        if len(quizzes) == limit:
+            next_cursor = {"after_title": quizzes[-1]["title"], "after_id": quizzes[-1]["id"]}
+        return {"quizzes": quizzes, "next": next_cursor}
+    
+    def get_quiz(self, quiz_id: int) -> Dict:
+        self.require_user()
+        quiz = self.server.db.get_quiz_for_taker(quiz_id)
+        if not quiz:
+            raise HTTPError(404, "Quiz not found")
+        return quiz
+    
+    def get_leaderboard(self, quiz_id: int) -> Dict:
+        if not self.server.db.get_quiz_for_taker(quiz_id):
+            raise HTTPError(404, "Quiz not found")
+        stats = self.server.db.get_quiz_stats(quiz_id)
+        stats["leaderboard"] = self.server.db.get_leaderboard(quiz_id)
+        return stats
+    
+    def submit(self, quiz_id: int, body: Dict) -> Dict:
+        user = self.require_user()
+        quiz = self.server.db.get_quiz_for_taker(quiz_id)
+        if not quiz:
+            raise HTTPError(404, "Quiz not found")
+        responses = parse_responses(quiz, body.get("responses"))
+        return self.server.db.submit_attempt(user["id"], quiz_id, responses)
+    
+    def log_message(self, format: str, *args) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+def parse_id(value, name: str) -> int:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.isdecimal():
+        return int(value)
+    raise ValueError(f"{name} must be an integer")
+
+def parse_responses(quiz: Dict, raw) -> Dict[int, List[int]]:
+    if not isinstance(raw, dict):
+        raise ValueError("responses must map question ids to lists of option ids")
+    
+    options = {question["id"]: {option["id"] for option in question["options"]} for question in quiz["questions"]}
+    single_choice = {question["id"] for question in quiz["questions"] if question["question_type"] == "single_choice"}
+    responses = {question_id: [] for question_id in options}
+    for question_id, selected in raw.items():
+        question_id = parse_id(question_id, "Question id")
+        if question_id not in options:
+            raise ValueError(f"Question {question_id} is not part of this quiz")
+        if not isinstance(selected, list):
+            selected = [selected]
+        for option_id in selected:
+            option_id = parse_id(option_id, "Option id")
+            if option_id not in options[question_id]:
+                raise ValueError(f"Option {option_id} does not belong to question {question_id}")
+            responses[question_id].append(option_id)
+        if question_id in single_choice and len(set(responses[question_id])) > 1:
+            raise ValueError(f"Question {question_id} accepts only one option")
+    return responses
+
+def serve(db_path: str, host: str, port: int, workers: int, quiet: bool = False,
+          max_connections: int = 256) -> None:
+    with Database(db_path, pool_size=workers) as db:
+        server = QuizServer((host, port), db, workers, quiet, max_connections)
+        print(f"Serving on http://{host}:{server.server_address[1]} with {workers} workers "
+              f"and up to {max_connections} connections", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+def request_json(conn: http.client.HTTPConnection, method: str, path: str,
+                 body: Optional[Dict] = None, token: Optional[str] = None) -> Dict:
+    headers = {"Content-Type": "application/json"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    conn.request(method, path, json.dumps(body) if body is not None else None, headers)
+    response = conn.getresponse()
+    payload = json.loads(response.read())
+    if response.status != 200:
+        raise RuntimeError(f"{method} {path} failed with {response.status}: {payload.get('error')}")
+    return payload
+
+def benchmark(host: str, port: int, username: str, password: str, clients: int, requests: int) -> Dict:
+    setup = http.client.HTTPConnection(host, port, timeout=30)
+    token = request_json(setup, "POST", "/login", {"username": username, "password": password})["token"]
+    quizzes = request_json(setup, "GET", "/quizzes?limit=1")["quizzes"]
+    if not quizzes:
+        raise RuntimeError("No quizzes to benchmark against")
+    quiz = request_json(setup, "GET", f"/quizzes/{quizzes[0]['id']}", token=token)
+    setup.close()
+    responses = {str(question["id"]): [question["options"][0]["id"]] for question in quiz["questions"] if question["options"]}
+    
+    latencies: List[float] = []
+    errors = []
+    lock = threading.Lock()
+    
+    def run_client(count: int) -> None:
+        conn = http.client.HTTPConnection(host, port, timeout=30)
+        local = []
+        try:
+            for i in range(count):
+                started = time.perf_counter()
+                if i % 2:
+                    request_json(conn, "POST", f"/quizzes/{quiz['id']}/submit", {"responses": responses}, token)
+                else:
+                    request_json(conn, "GET", f"/quizzes/{quiz['id']}", token=token)
+                local.append(time.perf_counter() - started)
+        except Exception as e:
+            with lock:
+                errors.append(e)
+        finally:
+            conn.close()
+            with lock:
+                latencies.extend(local)
+    
+    per_client = [requests // clients + (1 if i < requests % clients else 0) for i in range(clients)]
+    threads = [threading.Thread(target=run_client, args=(count,)) for count in per_client]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "elapsed": elapsed,
+        "requests_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000 if latencies else 0.0
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Headless HTTP/JSON quiz-taking service")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    serve_parser = subparsers.add_parser("serve", help="run the HTTP service")
+    serve_parser.add_argument("--db", default="quiz.db", help="database file")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="address to bind")
+    serve_parser.add_argument("--port", type=int, default=8080, help="port to bind")
+    serve_parser.add_argument("--workers", type=int, default=16, help="request worker threads")
+    serve_parser.add_argument("--max-connections", type=int, default=256, help="open connections accepted at once")
+    serve_parser.add_argument("--quiet", action="store_true", help="disable per-request logging")
+    
+    bench_parser = subparsers.add_parser("bench", help="measure throughput of a running service")
+    bench_parser.add_argument("--host", default="127.0.0.1", help="service address")
+    bench_parser.add_argument("--port", type=int, default=8080, help="service port")
+    bench_parser.add_argument("--username", default="admin", help="account used by the clients")
+    bench_parser.add_argument("--password", default="admin", help="password of the account")
+    bench_parser.add_argument("--clients", type=int, default=16, help="concurrent keep-alive connections")
+    bench_parser.add_argument("--requests", type=int, default=2000, help="total requests (alternating load and submit)")
+    args = parser.parse_args()
+    
+    if args.command == "serve":
+        serve(args.db, args.host, args.port, args.workers, args.quiet, args.max_connections)
+    else:
+        stats = benchmark(args.host, args.port, args.username, args.password, args.clients, args.requests)
+        print(f"{stats['requests']} requests, {stats['errors']} failed clients, in {stats['elapsed']:.2f}s "
+              f"({stats['requests_per_second']:.0f} req/s, p50 {stats['p50_ms']:.1f} ms, p99 {stats['p99_ms']:.1f} ms)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import math
+import secrets
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Dict, Hashable, Optional
+
+class RateLimitError(ValueError):
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class RateLimiter:
+    def __init__(self, max_events: int, window: float, max_keys: int = 100000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_events = max_events
+        self.window = window
+        self.max_keys = max_keys
+        self.clock = clock
+        self.events: Dict[Hashable, deque] = {}
+        self.lock = threading.Lock()
+    
+    def prune(self, key: Hashable, now: float) -> Optional[deque]:
+        events = self.events.get(key)
+        if events is None:
+            return None
+        while events and events[0] <= now - self.window:
+            events.popleft()
+        if not events:
+            del self.events[key]
+            return None
+        return events
+    
+    def retry_after(self, key: Hashable) -> float:
+        with self.lock:
+            now = self.clock()
+            events = self.prune(key, now)
+            if events is None or len(events) < self.max_events:
+                return 0.0
+            return events[-self.max_events] + self.window - now
+    
+    def check(self, key: Hashable, message: str) -> None:
+        retry_after = self.retry_after(key)
+        if retry_after > 0:
+            raise RateLimitError(f"{message} Try again in {math.ceil(retry_after)} seconds.", retry_after)
+    
+    def hit(self, key: Hashable) -> None:
+        with self.lock:
+            now = self.clock()
+            if key not in self.events and len(self.events) >= self.max_keys:
+                for stale in list(self.events):
+                    self.prune(stale, now)
+            events = self.prune(key, now)
+            if events is None:
+                events = self.events[key] = deque()
+            events.append(now)
+            while len(events) > self.max_events:
+                events.popleft()
+    
+    def reset(self, key: Hashable) -> None:
+        with self.lock:
+            self.events.pop(key, None)
+
+class SessionStore:
+    def __init__(self, ttl: float = 3600.0, max_sessions: int = 10000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.clock = clock
+        self.sessions: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+    
+    def create(self, user: Dict) -> str:
+        token = secrets.token_urlsafe(32)
+        with self.lock:
+            now = self.clock()
+            self.remove_expired(now)
+            self.sessions[token] = (user, now + self.ttl)
+            while len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False)
+        return token
+    
+    def get(self, token: str) -> Optional[Dict]:
+        with self.lock:
+            session = self.sessions.get(token)
+            if session is None:
+                return None
+            user, expires_at = session
+            now = self.clock()
+            if expires_at <= now:
+                del self.sessions[token]
+                return None
+            self.sessions[token] = (user, now + self.ttl)
+            self.sessions.move_to_end(token)
+            return user
+    
+    def revoke(self, token: str) -> None:
+        with self.lock:
+            self.sessions.pop(token, None)
+    
+    def revoke_user(self, user_id: int) -> None:
+        with self.lock:
+            for token in [token for token, (user, _) in self.sessions.items() if user["id"] == user_id]:
+                del self.sessions[token]
+    
+    def purge_expired(self) -> int:
+        with self.lock:
+            return self.remove_expired(self.clock())
+    
+    def remove_expired(self, now: float) -> int:
+        removed = 0
+        while self.sessions:
+            token, (_, expires_at) = next(iter(self.sessions.items()))
+            if expires_at > now:
+                break
+            del self.sessions[token]
+            removed += 1
+        return removed
+    
+    def __len__(self) -> int:
+        return len(self.sessions)
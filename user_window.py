@@ -1,10 +1,15 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from database import Database
 from styles import StyleManager
+from widgets import LazyListbox, OptionList, SearchEntry
+from db_worker import DatabaseWorker
 
 class UserWindow:
+    AUTOSAVE_DELAY = 1000
+    PREFETCH_AHEAD = 20
+    
     def __init__(self, db: Database, user: Dict, on_logout: callable = None):
         self.db = db
         self.user = user
@@ -12,6 +17,13 @@ class UserWindow:
         self.current_quiz = None
         self.current_question_index = 0
         self.user_responses = {}
+        self.attempt_id = None
+        self.dirty_questions = set()
+        self.autosave_job = None
+        self.autosave_running = False
+        self.loading_questions = set()
+        self.prefetch_job = None
+        self.prepared_index = None
         
         self.window = tk.Tk()
         self.window.title(f"Quiz System - User Panel ({user['username']})")
@@ -34,6 +46,10 @@ class UserWindow:
                                   command=self.sign_out, style='Warning.TButton')
         logout_button.pack(side=tk.RIGHT, padx=20, pady=10)
         
+        self.busy_bar = ttk.Progressbar(header_frame, mode='indeterminate', length=120)
+        self.busy_bar.pack(side=tk.RIGHT, padx=10, pady=20)
+        self.worker = DatabaseWorker(self.window, progress=self.busy_bar)
+        
         main_frame = ttk.Frame(self.window, padding="15")
         main_frame.pack(fill=tk.BOTH, expand=True)
         
@@ -46,21 +62,46 @@ class UserWindow:
         quiz_list_frame = ttk.LabelFrame(left_frame, text="Available Quizzes", padding="10")
         quiz_list_frame.pack(fill=tk.BOTH, expand=True)
         
+        search_frame = ttk.Frame(quiz_list_frame)
+        search_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(search_frame, text="Search:", font=('Arial', 10, 'bold')).pack(side=tk.LEFT)
+        self.search_entry = SearchEntry(search_frame, self.search_quizzes, font=('Arial', 10))
+        self.search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(10, 0))
+        
         list_frame = ttk.Frame(quiz_list_frame)
         list_frame.pack(fill=tk.BOTH, expand=True)
         
         scrollbar = ttk.Scrollbar(list_frame)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        self.quiz_listbox = tk.Listbox(list_frame, yscrollcommand=scrollbar.set,
-                                       font=('Arial', 10), bg='white', fg='#2c3e50',
+        self.quiz_listbox = tk.Listbox(list_frame, font=('Arial', 10), bg='white', fg='#2c3e50',
                                        selectbackground='#3498db')
         self.quiz_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.quiz_listbox.bind("<<ListboxSelect>>", self.on_quiz_select)
         scrollbar.config(command=self.quiz_listbox.yview)
+        self.quiz_pager = LazyListbox(
+            self.quiz_listbox, scrollbar, self.db.get_quizzes_page,
+            format_item=lambda quiz: quiz["title"],
+            page_cursor=lambda quiz: (quiz["title"], quiz["id"]),
+            worker=self.worker
+        )
         
         ttk.Button(quiz_list_frame, text="Start Quiz", command=self.start_quiz, 
                   style='Primary.TButton').pack(pady=(15, 0), fill=tk.X)
         
+        leaderboard_frame = ttk.LabelFrame(left_frame, text="Leaderboard", padding="10")
+        leaderboard_frame.pack(fill=tk.BOTH, expand=True, pady=(15, 0))
+        
+        self.stats_label = ttk.Label(leaderboard_frame, text="Select a quiz to see its leaderboard",
+                                    font=('Arial', 9), foreground='#7f8c8d')
+        self.stats_label.pack(anchor=tk.W, pady=(0, 5))
+        
+        self.leaderboard_listbox = tk.Listbox(leaderboard_frame, font=('Arial', 10), height=6,
+                                              bg='white', fg='#2c3e50', selectbackground='#3498db')
+        self.leaderboard_listbox.pack(fill=tk.BOTH, expand=True)
+        self.leaderboard_quiz_id = None
+        
         scores_frame = ttk.LabelFrame(left_frame, text="My Scores", padding="10")
         scores_frame.pack(fill=tk.BOTH, expand=True, pady=(15, 0))
         
@@ -70,11 +111,18 @@ class UserWindow:
         score_scrollbar = ttk.Scrollbar(scores_list_frame)
         score_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        self.scores_listbox = tk.Listbox(scores_list_frame, yscrollcommand=score_scrollbar.set, 
-                                         height=10, font=('Arial', 9),
+        self.scores_listbox = tk.Listbox(scores_list_frame, height=10, font=('Arial', 9),
                                          bg='white', fg='#2c3e50', selectbackground='#27ae60')
         self.scores_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         score_scrollbar.config(command=self.scores_listbox.yview)
+        self.scores_pager = LazyListbox(
+            self.scores_listbox, score_scrollbar,
+            lambda before, limit: self.db.get_user_scores_page(self.user["id"], before, limit),
+            format_item=self.format_score,
+            page_cursor=lambda score: (score["completed_at"], score["id"]),
+            empty_text="No scores yet. Take a quiz to see your results here!",
+            worker=self.worker
+        )
         
         self.quiz_frame = ttk.LabelFrame(right_frame, text="Quiz", padding="20")
         self.quiz_frame.pack(fill=tk.BOTH, expand=True)
@@ -90,7 +138,12 @@ class UserWindow:
         self.options_frame = ttk.Frame(self.quiz_frame)
         self.options_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
         
-        self.option_vars = {}
+        self.option_views = []
+        for _ in range(2):
+            frame = ttk.Frame(self.options_frame)
+            self.option_views.append((frame, OptionList(frame, self.on_option_toggled)))
+        self.active_view = 0
+        self.option_views[0][0].pack(fill=tk.BOTH, expand=True)
         
         nav_frame = ttk.Frame(self.quiz_frame)
         nav_frame.pack(fill=tk.X)
@@ -112,21 +165,50 @@ class UserWindow:
         self.progress_label.pack(pady=(15, 0))
     
     def load_quizzes(self) -> None:
-        self.quiz_listbox.delete(0, tk.END)
-        quizzes = self.db.get_all_quizzes()
-        for quiz in quizzes:
-            self.quiz_listbox.insert(tk.END, f"{quiz['title']}")
-        
-        scores = self.db.get_user_scores(self.user["id"])
-        self.scores_listbox.delete(0, tk.END)
-        if scores:
-            for score in scores:
-                percentage = (score["score"] / score["total_points"] * 100) if score["total_points"] > 0 else 0
-                grade = "[OK]" if percentage >= 80 else "[OK]" if percentage >= 60 else "[!]"
-                self.scores_listbox.insert(tk.END, 
-                    f"{grade} {score['quiz_title']}: {score['score']}/{score['total_points']} ({percentage:.1f}%)")
+        self.quiz_pager.reset()
+        self.scores_pager.reset()
+    
+    def search_quizzes(self, query: str) -> None:
+        if query:
+            self.quiz_pager.set_source(
+                lambda cursor, limit: [] if cursor else self.db.search_quizzes(query, limit))
         else:
-            self.scores_listbox.insert(tk.END, "No scores yet. Take a quiz to see your results here!")
+            self.quiz_pager.set_source(self.db.get_quizzes_page)
+    
+    @staticmethod
+    def format_score(score: Dict) -> str:
+        percentage = (score["score"] / score["total_points"] * 100) if score["total_points"] > 0 else 0
+        grade = "[OK]" if percentage >= 80 else "[OK]" if percentage >= 60 else "[!]"
+        return f"{grade} {score['quiz_title']}: {score['score']}/{score['total_points']} ({percentage:.1f}%)"
+    
+    def on_quiz_select(self, event: tk.Event) -> None:
+        selection = self.quiz_listbox.curselection()
+        if not selection:
+            return
+        selected_quiz = self.quiz_pager.get_item(selection[0])
+        if selected_quiz:
+            self.load_leaderboard(selected_quiz["id"])
+    
+    def load_leaderboard(self, quiz_id: int) -> None:
+        self.leaderboard_quiz_id = quiz_id
+        self.worker.submit(lambda: (self.db.get_quiz_stats(quiz_id), self.db.get_leaderboard(quiz_id)),
+                           on_success=self.on_leaderboard_loaded, error_title="Failed to load leaderboard")
+    
+    def on_leaderboard_loaded(self, result: Tuple[Dict, List[Dict]]) -> None:
+        stats, leaderboard = result
+        if stats["quiz_id"] != self.leaderboard_quiz_id:
+            return
+        
+        if stats["attempt_count"]:
+            self.stats_label.config(text=f"{stats['attempt_count']} attempts, "
+                                         f"average {stats['mean_score']:.1f}, best {stats['max_score']}")
+        else:
+            self.stats_label.config(text="No attempts yet")
+        
+        self.leaderboard_listbox.delete(0, tk.END)
+        for entry in leaderboard:
+            self.leaderboard_listbox.insert(
+                tk.END, f"{entry['rank']}. {entry['username']}: {entry['score']}/{entry['total_points']}")
     
     def start_quiz(self) -> None:
         selection = self.quiz_listbox.curselection()
@@ -134,25 +216,58 @@ class UserWindow:
             messagebox.showwarning("Warning", "Please select a quiz to start")
             return
         
-        quiz_title = self.quiz_listbox.get(selection[0])
-        quizzes = self.db.get_all_quizzes()
-        selected_quiz = next((q for q in quizzes if q["title"] == quiz_title), None)
-        
+        selected_quiz = self.quiz_pager.get_item(selection[0])
         if not selected_quiz:
             return
         
-        quiz = self.db.get_quiz_with_questions(selected_quiz["id"])
+        self.autosave()
+        self.worker.submit(self.load_quiz_session, selected_quiz["id"],
+                           on_success=self.on_quiz_loaded, error_title="Failed to load quiz")
+    
+    def load_quiz_session(self, quiz_id: int) -> Tuple[Optional[Dict], Optional[Dict]]:
+        quiz = self.db.get_quiz_outline(quiz_id)
+        attempt = self.db.get_open_attempt(self.user["id"], quiz_id)
+        if quiz:
+            questions = quiz["questions"]
+            start = attempt["current_index"] if attempt else 0
+            wanted = questions[:self.PREFETCH_AHEAD] + questions[max(start - 1, 0):start + self.PREFETCH_AHEAD]
+            bodies = self.db.get_question_bodies(quiz_id, [question["id"] for question in wanted])
+            for question in questions:
+                question.update(bodies.get(question["id"], {}))
+        return quiz, attempt
+    
+    def on_quiz_loaded(self, session: Tuple[Optional[Dict], Optional[Dict]]) -> None:
+        quiz, attempt = session
         if not quiz or not quiz["questions"]:
             messagebox.showerror("Error", "This quiz has no questions")
             return
         
+        if attempt and (attempt["responses"] or attempt["current_index"]):
+            if messagebox.askyesno("Resume Quiz", f"You have an unfinished attempt at '{quiz['title']}' "
+                                                  f"started {attempt['started_at']}.\n\nResume where you left off?"):
+                self.begin_attempt(quiz, attempt["id"], attempt["responses"], attempt["current_index"])
+                return
+            self.worker.submit(self.db.discard_attempt, attempt["id"])
+            attempt = None
+        
+        if attempt:
+            self.begin_attempt(quiz, attempt["id"], {}, 0)
+        else:
+            self.worker.submit(self.db.start_attempt, self.user["id"], quiz["id"],
+                               on_success=lambda attempt_id: self.begin_attempt(quiz, attempt_id, {}, 0),
+                               error_title="Failed to start quiz")
+    
+    def begin_attempt(self, quiz: Dict, attempt_id: int, responses: Dict[int, List[int]], index: int) -> None:
         self.current_quiz = quiz
-        self.current_question_index = 0
+        self.attempt_id = attempt_id
+        self.dirty_questions = set()
+        self.current_question_index = min(max(index, 0), len(quiz["questions"]) - 1)
         self.user_responses = {}
-        self.option_vars = {}
+        self.loading_questions = set()
+        self.prepared_index = None
         
         for question in quiz["questions"]:
-            self.user_responses[question["id"]] = []
+            self.user_responses[question["id"]] = list(responses.get(question["id"], []))
         
         self.display_question()
     
@@ -160,46 +275,20 @@ class UserWindow:
         if not self.current_quiz:
             return
         
-        for widget in self.options_frame.winfo_children():
-            widget.destroy()
-        
-        self.option_vars = {}
-        
         question = self.current_quiz["questions"][self.current_question_index]
         self.quiz_title_label.config(text=self.current_quiz["title"])
-        self.question_label.config(text=f"Q{self.current_question_index + 1}: {question['question_text']}")
-        
-        is_multiple = question["question_type"] == "multiple_choice"
-        
-        for opt in question["options"]:
-            if is_multiple:
-                var = tk.BooleanVar()
-                if opt["id"] in self.user_responses[question["id"]]:
-                    var.set(True)
-            else:
-                var = tk.IntVar(value=0)
-                if opt["id"] in self.user_responses[question["id"]]:
-                    var.set(opt["id"])
-            
-            self.option_vars[opt["id"]] = var
-            
-            if is_multiple:
-                checkbox = ttk.Checkbutton(
-                    self.options_frame,
-                    text=opt["option_text"],
-                    variable=var,
-                    command=lambda oid=opt["id"]: self.save_response(question["id"], oid, is_multiple)
-                )
-                checkbox.pack(anchor=tk.W, pady=8, padx=10)
+        if "options" not in question:
+            self.question_label.config(text=f"Q{self.current_question_index + 1}: Loading...")
+            self.option_views[self.active_view][1].clear()
+            self.load_question_bodies(self.current_question_index)
+        else:
+            self.question_label.config(text=f"Q{self.current_question_index + 1}: {question['question_text']}")
+            if self.prepared_index == self.current_question_index:
+                self.swap_option_view()
             else:
-                radio = ttk.Radiobutton(
-                    self.options_frame,
-                    text=opt["option_text"],
-                    variable=var,
-                    value=opt["id"],
-                    command=lambda oid=opt["id"]: self.save_response(question["id"], oid, is_multiple)
-                )
-                radio.pack(anchor=tk.W, pady=8, padx=10)
+                self.render_question(self.active_view, question)
+        self.prepared_index = None
+        self.schedule_prefetch()
         
         self.prev_button.config(state=tk.NORMAL if self.current_question_index > 0 else tk.DISABLED)
         
@@ -210,6 +299,71 @@ class UserWindow:
         
         self.progress_label.config(text=f"Question {self.current_question_index + 1} of {total_questions}")
     
+    def render_question(self, view: int, question: Dict) -> None:
+        is_multiple = question["question_type"] == "multiple_choice"
+        self.option_views[view][1].show(question["options"], self.user_responses[question["id"]], is_multiple)
+    
+    def swap_option_view(self) -> None:
+        self.option_views[self.active_view][0].pack_forget()
+        self.active_view = 1 - self.active_view
+        self.option_views[self.active_view][0].pack(fill=tk.BOTH, expand=True)
+    
+    def schedule_prefetch(self) -> None:
+        if not self.prefetch_job:
+            self.prefetch_job = self.window.after_idle(self.prefetch)
+    
+    def prefetch(self) -> None:
+        self.prefetch_job = None
+        if not self.current_quiz:
+            return
+        
+        questions = self.current_quiz["questions"]
+        index = self.current_question_index
+        self.load_question_bodies(index)
+        
+        next_index = index + 1
+        if next_index < len(questions) and "options" in questions[next_index]:
+            self.render_question(1 - self.active_view, questions[next_index])
+            self.prepared_index = next_index
+    
+    def load_question_bodies(self, index: int) -> None:
+        questions = self.current_quiz["questions"][max(index - 1, 0):index + self.PREFETCH_AHEAD]
+        missing = [question["id"] for question in questions
+                   if "options" not in question and question["id"] not in self.loading_questions]
+        if not missing:
+            return
+        
+        quiz_id = self.current_quiz["id"]
+        self.loading_questions.update(missing)
+        self.worker.submit(self.db.get_question_bodies, quiz_id, missing,
+                           on_success=lambda bodies: self.on_question_bodies_loaded(quiz_id, missing, bodies),
+                           on_error=lambda error: self.on_question_bodies_failed(quiz_id, missing, error))
+    
+    def on_question_bodies_loaded(self, quiz_id: int, question_ids: List[int], bodies: Dict[int, Dict]) -> None:
+        if not self.current_quiz or self.current_quiz["id"] != quiz_id:
+            return
+        
+        self.loading_questions.difference_update(question_ids)
+        requested = set(question_ids)
+        for question in self.current_quiz["questions"]:
+            if question["id"] in requested:
+                question.update(bodies.get(question["id"], {"question_text": "(question removed)", "options": []}))
+        
+        current = self.current_quiz["questions"][self.current_question_index]
+        if current["id"] in requested:
+            self.display_question()
+        else:
+            self.schedule_prefetch()
+    
+    def on_question_bodies_failed(self, quiz_id: int, question_ids: List[int], error: Exception) -> None:
+        if self.current_quiz and self.current_quiz["id"] == quiz_id:
+            self.loading_questions.difference_update(question_ids)
+            messagebox.showerror("Error", f"Failed to load questions: {str(error)}")
+    
+    def on_option_toggled(self, option_id: int) -> None:
+        question = self.current_quiz["questions"][self.current_question_index]
+        self.save_response(question["id"], option_id, question["question_type"] == "multiple_choice")
+    
     def save_response(self, question_id: int, option_id: int, is_multiple: bool) -> None:
         if is_multiple:
             if option_id in self.user_responses[question_id]:
@@ -218,16 +372,51 @@ class UserWindow:
                 self.user_responses[question_id].append(option_id)
         else:
             self.user_responses[question_id] = [option_id]
+        self.dirty_questions.add(question_id)
+        self.schedule_autosave()
+    
+    def schedule_autosave(self) -> None:
+        if self.autosave_job:
+            self.window.after_cancel(self.autosave_job)
+        self.autosave_job = self.window.after(self.AUTOSAVE_DELAY, self.autosave)
+    
+    def autosave(self) -> None:
+        if self.autosave_job:
+            self.window.after_cancel(self.autosave_job)
+            self.autosave_job = None
+        if self.attempt_id is None or self.autosave_running:
+            return
+        
+        attempt_id = self.attempt_id
+        dirty = self.dirty_questions
+        self.dirty_questions = set()
+        responses = {question_id: list(self.user_responses[question_id]) for question_id in dirty}
+        self.autosave_running = True
+        self.worker.submit(self.db.save_attempt_progress, attempt_id, responses, self.current_question_index,
+                           on_success=lambda _: self.on_autosaved(attempt_id),
+                           on_error=lambda error: self.on_autosave_failed(attempt_id, dirty))
+    
+    def on_autosaved(self, attempt_id: int) -> None:
+        self.autosave_running = False
+        if self.dirty_questions and attempt_id == self.attempt_id:
+            self.schedule_autosave()
+    
+    def on_autosave_failed(self, attempt_id: int, dirty: set) -> None:
+        self.autosave_running = False
+        if attempt_id == self.attempt_id:
+            self.dirty_questions |= dirty
     
     def prev_question(self) -> None:
         if self.current_question_index > 0:
             self.current_question_index -= 1
             self.display_question()
+            self.schedule_autosave()
     
     def next_question(self) -> None:
         if self.current_question_index < len(self.current_quiz["questions"]) - 1:
             self.current_question_index += 1
             self.display_question()
+            self.schedule_autosave()
     
     def submit_quiz(self) -> None:
         if not self.current_quiz:
@@ -236,48 +425,69 @@ class UserWindow:
         if not messagebox.askyesno("Confirm Submission", "Are you sure you want to submit the quiz?\nYou cannot change your answers after submission."):
             return
         
-        try:
-            all_responses = []
-            for question_id, selected_options in self.user_responses.items():
-                for option_id in selected_options:
-                    all_responses.append((question_id, option_id))
-            
-            if all_responses:
-                self.db.save_all_responses(self.user["id"], all_responses)
-            
-            score, total_points = self.db.calculate_score(self.user["id"], self.current_quiz["id"])
-            self.db.save_score(self.user["id"], self.current_quiz["id"], score, total_points)
-            
-            percentage = (score / total_points * 100) if total_points > 0 else 0
-            messagebox.showinfo(
-                "Quiz Completed!",
-                f"Your Results:\n\n"
-                f"Score: {score}/{total_points} points\n"
-                f"Percentage: {percentage:.1f}%\n\n"
-                f"Correct answers: {score}\n"
-                f"Total points: {total_points}"
-            )
-            
-            self.load_quizzes()
-            self.current_quiz = None
-            self.current_question_index = 0
-            self.user_responses = {}
-            self.quiz_title_label.config(text="Select a quiz to start")
-            self.question_label.config(text="")
-            for widget in self.options_frame.winfo_children():
-                widget.destroy()
-            self.progress_label.config(text="")
-            self.prev_button.config(state=tk.DISABLED)
-            self.next_button.config(state=tk.NORMAL)
-            self.submit_button.config(state=tk.DISABLED)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to submit quiz: {str(e)}")
+        self.submit_button.config(state=tk.DISABLED)
+        if self.autosave_job:
+            self.window.after_cancel(self.autosave_job)
+            self.autosave_job = None
+        responses = {question_id: list(selected) for question_id, selected in self.user_responses.items()}
+        self.worker.submit(self.db.submit_attempt, self.user["id"], self.current_quiz["id"], responses,
+                           self.attempt_id, on_success=self.on_quiz_submitted, on_error=self.on_submit_failed)
+    
+    def on_quiz_submitted(self, result: Dict) -> None:
+        score, total_points = result["score"], result["total_points"]
+        
+        percentage = (score / total_points * 100) if total_points > 0 else 0
+        messagebox.showinfo(
+            "Quiz Completed!",
+            f"Your Results:\n\n"
+            f"Score: {score}/{total_points} points\n"
+            f"Percentage: {percentage:.1f}%\n\n"
+            f"Correct answers: {score}\n"
+            f"Total points: {total_points}"
+        )
+        
+        self.load_quizzes()
+        self.load_leaderboard(self.current_quiz["id"])
+        self.current_quiz = None
+        self.current_question_index = 0
+        self.user_responses = {}
+        self.attempt_id = None
+        self.dirty_questions = set()
+        self.quiz_title_label.config(text="Select a quiz to start")
+        self.question_label.config(text="")
+        for _, option_list in self.option_views:
+            option_list.clear()
+        self.prepared_index = None
+        self.progress_label.config(text="")
+        self.prev_button.config(state=tk.DISABLED)
+        self.next_button.config(state=tk.NORMAL)
+        self.submit_button.config(state=tk.DISABLED)
+    
+    def on_submit_failed(self, error: Exception) -> None:
+        self.submit_button.config(state=tk.NORMAL)
+        messagebox.showerror("Error", f"Failed to submit quiz: {str(error)}")
     
     def sign_out(self) -> None:
         if messagebox.askyesno("Sign Out", "Are you sure you want to sign out?"):
+            self.save_progress_now()
+            self.worker.shutdown()
             self.window.destroy()
             if self.on_logout:
                 self.on_logout()
     
+    def save_progress_now(self) -> None:
+        if self.autosave_job:
+            self.window.after_cancel(self.autosave_job)
+            self.autosave_job = None
+        if self.attempt_id is None:
+            return
+        
+        responses = {question_id: list(self.user_responses[question_id]) for question_id in self.dirty_questions}
+        try:
+            self.db.save_attempt_progress(self.attempt_id, responses, self.current_question_index)
+            self.dirty_questions = set()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save quiz progress: {str(e)}")
+    
     def run(self) -> None:
         self.window.mainloop()
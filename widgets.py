@@ -0,0 +1,174 @@
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Dict, List, Optional
+
+class LazyListbox:
+    def __init__(self, listbox: tk.Listbox, scrollbar: ttk.Scrollbar,
+                 fetch_page: Callable[[Optional[tuple], int], List[Dict]],
+                 format_item: Callable[[Dict], str], page_cursor: Callable[[Dict], tuple],
+                 page_size: int = 50, empty_text: str = "", worker=None):
+        self.listbox = listbox
+        self.scrollbar = scrollbar
+        self.fetch_page = fetch_page
+        self.format_item = format_item
+        self.page_cursor = page_cursor
+        self.page_size = page_size
+        self.empty_text = empty_text
+        self.worker = worker
+        self.generation = 0
+        self.items = []
+        self.cursor = None
+        self.exhausted = False
+        self.loading = False
+        self.scheduled = False
+        
+        self.listbox.config(yscrollcommand=self.on_scroll)
+    
+    def set_source(self, fetch_page: Callable[[Optional[tuple], int], List[Dict]]) -> None:
+        self.fetch_page = fetch_page
+        self.reset()
+    
+    def reset(self) -> None:
+        self.generation += 1
+        self.listbox.delete(0, tk.END)
+        self.items = []
+        self.cursor = None
+        self.exhausted = False
+        self.loading = False
+        self.load_more()
+    
+    def load_more(self) -> None:
+        if self.loading or self.exhausted:
+            return
+        
+        self.loading = True
+        if self.worker is None:
+            try:
+                page = self.fetch_page(self.cursor, self.page_size)
+            finally:
+                self.loading = False
+            self.add_page(page)
+            return
+        
+        generation = self.generation
+        self.worker.submit(self.fetch_page, self.cursor, self.page_size,
+                           on_success=lambda page: self.on_page_loaded(generation, page),
+                           on_error=lambda error: self.on_page_failed(generation, error))
+    
+    def on_page_loaded(self, generation: int, page: List[Dict]) -> None:
+        if generation != self.generation:
+            return
+        self.loading = False
+        self.add_page(page)
+    
+    def on_page_failed(self, generation: int, error: Exception) -> None:
+        if generation != self.generation:
+            return
+        self.loading = False
+        self.exhausted = True
+        self.listbox.insert(tk.END, f"Failed to load: {error}")
+    
+    def add_page(self, page: List[Dict]) -> None:
+        if not self.items and not page and self.empty_text:
+            self.listbox.insert(tk.END, self.empty_text)
+        
+        for item in page:
+            self.listbox.insert(tk.END, self.format_item(item))
+        self.items.extend(page)
+        if page:
+            self.cursor = self.page_cursor(page[-1])
+        if len(page) < self.page_size:
+            self.exhausted = True
+    
+    def on_scroll(self, first: str, last: str) -> None:
+        self.scrollbar.set(first, last)
+        if float(last) >= 0.9 and not self.exhausted and not self.scheduled:
+            self.scheduled = True
+            self.listbox.after_idle(self.load_scheduled)
+    
+    def load_scheduled(self) -> None:
+        self.scheduled = False
+        self.load_more()
+    
+    def get_item(self, index: int) -> Optional[Dict]:
+        if 0 <= index < len(self.items):
+            return self.items[index]
+        return None
+
+class SearchEntry(ttk.Entry):
+    def __init__(self, parent: tk.Widget, on_search: Callable[[str], None], delay: int = 250, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.on_search = on_search
+        self.delay = delay
+        self.pending = None
+        self.last_query = ""
+        self.bind("<KeyRelease>", self.schedule_search)
+    
+    def schedule_search(self, event: Optional[tk.Event] = None) -> None:
+        if self.pending:
+            self.after_cancel(self.pending)
+        self.pending = self.after(self.delay, self.run_search)
+    
+    def run_search(self) -> None:
+        self.pending = None
+        query = self.get().strip()
+        if query != self.last_query:
+            self.last_query = query
+            self.on_search(query)
+
+class OptionList:
+    def __init__(self, parent: tk.Widget, on_toggle: Callable[[int], None]):
+        self.parent = parent
+        self.on_toggle = on_toggle
+        self.radio_var = tk.IntVar(value=0)
+        self.radios: List[ttk.Radiobutton] = []
+        self.checks: List[ttk.Checkbutton] = []
+        self.check_vars: List[tk.BooleanVar] = []
+        self.visible: List[ttk.Widget] = []
+        self.option_ids: List[int] = []
+    
+    def show(self, options: List[Dict], selected: List[int], is_multiple: bool) -> None:
+        pool = self.checks if is_multiple else self.radios
+        while len(pool) < len(options):
+            self.add_widget(is_multiple)
+        
+        self.option_ids = [opt["id"] for opt in options]
+        selected = set(selected)
+        if is_multiple:
+            for widget, var, opt in zip(pool, self.check_vars, options):
+                widget.config(text=opt["option_text"])
+                var.set(opt["id"] in selected)
+        else:
+            for widget, opt in zip(pool, options):
+                widget.config(text=opt["option_text"], value=opt["id"])
+            self.radio_var.set(next((oid for oid in self.option_ids if oid in selected), 0))
+        
+        widgets = pool[:len(options)]
+        if widgets != self.visible:
+            for widget in self.visible:
+                widget.pack_forget()
+            for widget in widgets:
+                widget.pack(anchor=tk.W, pady=8, padx=10)
+            self.visible = widgets
+    
+    def add_widget(self, is_multiple: bool) -> None:
+        if is_multiple:
+            index = len(self.checks)
+            var = tk.BooleanVar(value=False)
+            self.check_vars.append(var)
+            self.checks.append(ttk.Checkbutton(self.parent, variable=var,
+                                               command=lambda: self.toggle(index)))
+        else:
+            index = len(self.radios)
+            self.radios.append(ttk.Radiobutton(self.parent, variable=self.radio_var,
+                                               command=lambda: self.toggle(index)))
+    
+    def toggle(self, index: int) -> None:
+        if index < len(self.option_ids):
+            self.on_toggle(self.option_ids[index])
+    
+    def clear(self) -> None:
+        for widget in self.visible:
+            widget.pack_forget()
+        self.visible = []
+        self.option_ids = []